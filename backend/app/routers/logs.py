@@ -5,11 +5,14 @@
 
 from fastapi import APIRouter, Query, HTTPException
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Annotated
-import json
+import asyncio
 import os
+import time
 
 import httpx
+import orjson
 
 router = APIRouter(prefix="/api/logs", tags=["logs"])
 
@@ -17,6 +20,81 @@ VICTORIALOGS_URL = os.getenv("VICTORIALOGS_URL", "http://victorialogs:9428")
 MAX_ENTRIES = 2000  # Guardrail: prevent memory explosion
 MAX_RANGE_HOURS = 24  # Guardrail: prevent expensive full scans
 QUERY_TIMEOUT = 10.0  # seconds
+CACHE_TTL = 3.0  # seconds: absorbs identical UI polls
+CACHE_MAX_ENTRIES = 128
+PARSE_OFFLOAD_BYTES = 256 * 1024  # parse larger responses off the event loop
+
+# Short-lived response cache for polled endpoints: key -> (expires_at, task)
+_query_cache: dict[tuple, tuple[float, asyncio.Task]] = {}
+
+
+@lru_cache(maxsize=32)
+def _format_iso_second(dt: datetime, utcoffset: Optional[timedelta]) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _iso_utc(dt: datetime) -> str:
+    """
+    Format a time filter bound as LogsQL ISO time, memoized per second.
+    Polling requests share the same default bounds within a second.
+    """
+    # The offset is part of the key: equal instants in different zones format differently
+    return _format_iso_second(dt.replace(microsecond=0), dt.utcoffset())
+
+
+@lru_cache(maxsize=64)
+def _exclusion_fragment(containers: tuple[str, ...]) -> str:
+    """Build the container exclusion filter once per distinct container set."""
+    return " ".join(f'container_name:!"{c}"' for c in containers)
+
+
+def _parse_ndjson(body: bytes) -> list:
+    """Parse VictoriaLogs newline-delimited JSON, skipping malformed lines."""
+    logs = []
+    for line in body.splitlines():
+        if line:
+            try:
+                logs.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                continue
+    return logs
+
+
+async def _cached_get_logs(window: timedelta, **kwargs):
+    """
+    Run get_logs over the last `window` through a short TTL cache.
+
+    Concurrent or repeated polls with identical parameters within CACHE_TTL
+    share a single VictoriaLogs round-trip. The key holds the window length,
+    not its start, which is fixed when the shared query runs. Failures are
+    not cached.
+    """
+    key = (window,) + tuple(
+        (k, tuple(v) if isinstance(v, list) else v)
+        for k, v in sorted(kwargs.items())
+    )
+    now = time.monotonic()
+
+    entry = _query_cache.get(key)
+    if entry is None or entry[0] <= now:
+        # Evict expired entries, then the oldest if still over capacity
+        for k in [k for k, (exp, _) in _query_cache.items() if exp <= now]:
+            del _query_cache[k]
+        while len(_query_cache) >= CACHE_MAX_ENTRIES:
+            del _query_cache[next(iter(_query_cache))]
+
+        query = get_logs(start=datetime.utcnow() - window, **kwargs)
+        entry = (now + CACHE_TTL, asyncio.ensure_future(query))
+        _query_cache[key] = entry
+
+    task = entry[1]
+    try:
+        # Shield so one disconnecting poller doesn't cancel the shared query
+        return await asyncio.shield(task)
+    except Exception:
+        if _query_cache.get(key) is entry:
+            del _query_cache[key]
+        raise
 
 
 @router.get("/")
@@ -63,8 +141,8 @@ async def get_logs(
     query_parts = []
     
     # Time filter (always first for performance)
-    start_iso = start.strftime("%Y-%m-%dT%H:%M:%SZ")
-    end_iso = end.strftime("%Y-%m-%dT%H:%M:%SZ")
+    start_iso = _iso_utc(start)
+    end_iso = _iso_utc(end)
     query_parts.append(f"_time:[{start_iso}, {end_iso}]")
     
     # Stream field filters
@@ -77,8 +155,7 @@ async def get_logs(
     
     # Exclusions
     if exclude_containers and isinstance(exclude_containers, (list, tuple)):
-        for container in exclude_containers:
-            query_parts.append(f'container_name:!"{container}"')
+        query_parts.append(_exclusion_fragment(tuple(exclude_containers)))
     
     # Full-text search
     if search:
@@ -97,14 +174,13 @@ async def get_logs(
             )
             resp.raise_for_status()
             
-            # VictoriaLogs returns newline-delimited JSON
-            logs = []
-            for line in resp.text.strip().split("\n"):
-                if line:
-                    try:
-                        logs.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
+            # VictoriaLogs returns newline-delimited JSON. Large responses are
+            # parsed in a worker thread so other requests aren't stalled.
+            body = resp.content
+            if len(body) > PARSE_OFFLOAD_BYTES:
+                logs = await asyncio.to_thread(_parse_ndjson, body)
+            else:
+                logs = _parse_ndjson(body)
             
             return {"logs": logs, "count": len(logs), "query": query}
             
@@ -131,13 +207,13 @@ async def tail_logs(
     Get most recent logs (last 5 minutes).
     Optimized for React UI polling.
     """
-    return await get_logs(
+    return await _cached_get_logs(
+        timedelta(minutes=5),
         strategy_id=strategy_id,
         source=source,
         level=level,
         exclude_containers=exclude_containers,
         search=search,
-        start=datetime.utcnow() - timedelta(minutes=5),
         limit=limit,
     )
 
@@ -177,10 +253,10 @@ async def get_recent_errors(
     """
     Get recent ERROR and CRITICAL logs from the last hour.
     """
-    return await get_logs(
+    return await _cached_get_logs(
+        timedelta(hours=1),
         strategy_id=strategy_id,
         level="ERROR",
-        start=datetime.utcnow() - timedelta(hours=1),
         limit=limit,
     )
 
@@ -12,15 +12,500 @@ Features:
 """
 
 import sqlite3
+import atexit
 import logging
 import os
 import json
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+import threading
+import time
+import weakref
+from collections import deque
+from datetime import datetime, timezone, time as dtime
+from typing import Optional, Dict, Any, List, Union
 from contextlib import contextmanager
+from zoneinfo import ZoneInfo
+
+import orjson
 
 logger = logging.getLogger("app.services.trading_data")
 
+SCHEMA_VERSION = 7  # Bump with a matching migration step in _init_db
+
+# WAL checkpointing is done by a background thread instead of SQLite's
+# auto-checkpoint, so checkpoint I/O never lands inside a trading write.
+CHECKPOINT_INTERVAL = 30  # seconds
+METRICS_FLUSH_INTERVAL = 1.0  # seconds between batched trade metrics writes
+OPTIMIZE_INTERVAL = 600  # seconds between PRAGMA optimize runs
+INCREMENTAL_VACUUM_PAGES = 1000  # free pages returned to the OS per maintenance pass
+MAX_PNL_SNAPSHOTS = 1000  # most recent P&L snapshots kept per trade
+MIGRATION_BATCH_SIZE = 1000  # DrawdownRecorder rows written per bulk transaction
+MMAP_SIZE = 256 * 1024 * 1024  # bytes of the database file read via mmap
+JOURNAL_SIZE_LIMIT = 64 * 1024 * 1024  # bytes the WAL file is truncated back to after a checkpoint
+BUSY_TIMEOUT = 3.0  # seconds to wait on another process's lock before SQLITE_BUSY
+MARKET_TZ = ZoneInfo("America/New_York")
+
+# One maintenance thread per database file, shared by all service instances,
+# with the event that stops it: {path: (thread, stop_event)}
+_checkpointers: Dict[str, tuple] = {}
+_checkpointers_lock = threading.Lock()
+
+# Database files whose directory and schema are already set up in this
+# process; later instances on the same file skip the DDL pass
+_initialized_paths: set = set()
+_initialized_lock = threading.Lock()
+
+
+# In-process single writer per database file: concurrent writer threads queue
+# on this lock instead of contending for SQLite's file lock (SQLITE_BUSY)
+_write_locks: Dict[str, threading.RLock] = {}
+
+# Connection pool per database file, shared by every service instance on that
+# file (the API and strategies each hold one), so a thread keeps a single warm
+# connection per file. "refs" counts the open services using the pool:
+# {"local": threading.local, "connections": [...], "lock": Lock, "refs": int}
+_pools: Dict[str, Dict[str, Any]] = {}
+
+# get_strategy_stats results per (database, strategy_id), with None as the
+# all-strategies key. Entries are dropped when a commit changes the rollup;
+# the TTL only bounds staleness from writers in other processes.
+STATS_CACHE_TTL = 2.0  # seconds
+_stats_cache: Dict[tuple, tuple] = {}
+
+# Live service instances, so pooled connections can be closed at exit
+_services: "weakref.WeakSet[TradingDataService]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all_services():
+    for service in list(_services):
+        service.close()
+    # Pools of services that were garbage collected without close()
+    for db_key in list(_pools):
+        _release_pool(db_key)
+
+
+def _stop_checkpointer(db_key: str):
+    """Stop and join the maintenance thread of a database file, if running."""
+    with _checkpointers_lock:
+        entry = _checkpointers.pop(db_key, None)
+    if entry is None:
+        return
+    worker, stop = entry
+    stop.set()
+    if worker is not threading.current_thread():
+        worker.join(timeout=30)
+
+
+def _release_pool(db_key: str):
+    """Stop the maintenance thread and close every pooled connection of a file."""
+    _stop_checkpointer(db_key)
+    pool = _pools[db_key]
+    with pool["lock"]:
+        connections, pool["connections"] = pool["connections"], []
+        pool["local"] = threading.local()
+    for conn in connections:
+        try:
+            conn.execute("PRAGMA optimize")
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Failed to close trading database connection: {e}")
+
+
+# Epoch-millisecond views of the ISO-8601 entry/exit times, so sorting and
+# range scans compare fixed-size integers instead of variable-length text
+_EPOCH_MS_SQL = "CAST(ROUND((julianday({column}) - 2440587.5) * 86400000) AS INTEGER)"
+_ENTRY_TS_COLUMN_DEF = f"entry_ts INTEGER GENERATED ALWAYS AS ({_EPOCH_MS_SQL.format(column='entry_time')}) VIRTUAL"
+_EXIT_TS_COLUMN_DEF = f"exit_ts INTEGER GENERATED ALWAYS AS ({_EPOCH_MS_SQL.format(column='exit_time')}) VIRTUAL"
+
+_INSERT_TRADE_SQL = """
+    INSERT INTO trades (
+        trade_id, strategy_id, instrument_id, trade_type,
+        entry_price, quantity, direction, entry_time,
+        entry_reason, entry_target_price, entry_stop_loss,
+        strikes, expiration, legs, strategy_config,
+        max_profit, max_loss, entry_premium_per_contract,
+        status
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'OPEN')
+"""
+
+_INSERT_ORDER_SQL = """
+    INSERT INTO orders (
+        strategy_id, instrument_id, exchange_order_id, client_order_id,
+        trade_id, trade_type, trade_direction, order_side, order_type,
+        quantity, price_limit, status, submitted_time,
+        filled_time, filled_quantity, filled_price, commission, raw_data
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(exchange_order_id) DO NOTHING
+    RETURNING id
+"""
+
+# result is generated from net_pnl, so it is not written here. The duration is
+# taken from the stored entry_ts; the exit time is bound a second time because
+# SET expressions see the row's old exit_time.
+_CLOSE_TRADE_SQL = f"""
+    UPDATE trades SET
+        exit_time = ?,
+        exit_price = ?,
+        exit_reason = ?,
+        duration_seconds = ({_EPOCH_MS_SQL.format(column='?')} - entry_ts) / 1000,
+        pnl = ?,
+        commission = ?,
+        net_pnl = ?,
+        max_unrealized_profit = ?,
+        max_unrealized_loss = ?,
+        max_unrealized_loss_time = ?,
+        pnl_snapshots = ?,
+        status = 'CLOSED',
+        updated_at = datetime('now')
+    WHERE trade_id = ?
+"""
+
+# updated_at is bound from _sql_now() in the statements below, so a batch
+# shares one timestamp instead of calling datetime('now') per row.
+#
+# Scalar metrics only: pnl_snapshots grows every tick, so it is encoded and
+# written once, by _CLOSE_TRADE_SQL, rather than on every flush. Open trades
+# only: a flush that read its values before a concurrent close must not
+# overwrite the final metrics the close wrote.
+_UPDATE_TRADE_METRICS_SQL = """
+    UPDATE trades SET
+        max_unrealized_profit = ?,
+        max_unrealized_loss = ?,
+        max_unrealized_loss_time = ?,
+        updated_at = ?
+    WHERE trade_id = ? AND status = 'OPEN'
+"""
+
+# Partial fills (update_trade_quantity): the trade and its ENTRY order change
+# together, as two constant statements served from the statement cache.
+# max_profit / max_loss are rescaled in place from the row's current values
+# (SET expressions see the old row); the new quantity is bound three times.
+_UPDATE_TRADE_QUANTITY_SQL = """
+    UPDATE trades SET
+        quantity = ?,
+        max_profit = CASE
+            WHEN entry_premium_per_contract <> 0 THEN entry_premium_per_contract * ?
+        END,
+        max_loss = CASE
+            WHEN max_profit IS NULL OR max_profit = 0 THEN max_loss
+            WHEN max_loss IS NULL OR max_loss = 0 THEN NULL
+            WHEN entry_premium_per_contract <> 0
+                THEN max_loss * (? / (max_profit / entry_premium_per_contract))
+            ELSE max_loss
+        END,
+        updated_at = ?
+    WHERE trade_id = ?
+    RETURNING max_profit, max_loss
+"""
+
+_UPDATE_ENTRY_ORDER_QUANTITY_SQL = """
+    UPDATE orders SET
+        quantity = ?,
+        filled_quantity = ?,
+        updated_at = ?
+    WHERE trade_id = ? AND trade_direction = 'ENTRY'
+"""
+
+
+# trades.result is derived from net_pnl so it can never disagree with it
+_RESULT_COLUMN_DEF = """
+    result TEXT GENERATED ALWAYS AS (
+        CASE
+            WHEN net_pnl IS NULL THEN NULL
+            WHEN net_pnl > 0 THEN 'WIN'
+            WHEN net_pnl < 0 THEN 'LOSS'
+            ELSE 'BREAKEVEN'
+        END
+    ) VIRTUAL
+"""
+
+# Recompute strategy_stats rows from closed trades. The aggregate table keeps
+# sums and counts (not averages) so per-strategy rows can be summed for totals.
+_COUNT_RESULT_SQL = (
+    "(SELECT COUNT(*) FROM trades r "
+    "WHERE r.strategy_id = t.strategy_id AND r.status = 'CLOSED' AND r.result = '{result}')"
+)
+
+_STATS_AGGREGATE_SQL = """
+    INSERT INTO strategy_stats (
+        strategy_id, total_trades, wins, losses,
+        gross_pnl, net_pnl, net_pnl_count, commission,
+        best_trade, worst_trade,
+        max_dd_sum, max_dd_count, worst_drawdown
+    )
+    SELECT
+        strategy_id,
+        COUNT(*),
+        {wins},
+        {losses},
+        SUM(pnl),
+        SUM(net_pnl),
+        COUNT(net_pnl),
+        SUM(commission),
+        MAX(net_pnl),
+        MIN(net_pnl),
+        SUM(max_unrealized_loss),
+        COUNT(max_unrealized_loss),
+        MIN(max_unrealized_loss)
+    FROM trades t
+    WHERE {where}
+    GROUP BY strategy_id
+""".format(
+    # Counted on idx_trades_strategy_result, which holds the generated result
+    # precomputed, instead of evaluating it per row in a CASE
+    wins=_COUNT_RESULT_SQL.format(result="WIN"),
+    losses=_COUNT_RESULT_SQL.format(result="LOSS"),
+    where="{where}",
+)
+
+# Statements are fully formatted here, once, so hot paths pass a constant
+# string straight to execute() and hit the statement cache by identity
+_STATS_AGGREGATE_ALL_SQL = _STATS_AGGREGATE_SQL.format(where="status = 'CLOSED'")
+_STATS_AGGREGATE_ONE_SQL = _STATS_AGGREGATE_SQL.format(where="strategy_id = ? AND status = 'CLOSED'")
+
+# SUM() semantics for the incremental rollup: NULL values are skipped, and the
+# total stays NULL until a non-NULL value is added
+_STATS_ADD_SQL = "CASE WHEN excluded.{col} IS NULL THEN {col} ELSE COALESCE({col}, 0) + excluded.{col} END"
+# MAX()/MIN() semantics: the scalar functions return NULL if either side is
+_STATS_EXTREME_SQL = "{fn}(COALESCE({col}, excluded.{col}), COALESCE(excluded.{col}, {col}))"
+
+# A newly closed trade is added to its strategy's rollup row in place, so
+# closing costs O(1) instead of re-aggregating the strategy's history
+_STATS_CLOSE_TRIGGER_SQL = """
+    CREATE TRIGGER IF NOT EXISTS trg_trades_close_stats
+    AFTER UPDATE OF status ON trades
+    WHEN NEW.status = 'CLOSED' AND OLD.status IS NOT 'CLOSED'
+    BEGIN
+        INSERT INTO strategy_stats (
+            strategy_id, total_trades, wins, losses,
+            gross_pnl, net_pnl, net_pnl_count, commission,
+            best_trade, worst_trade,
+            max_dd_sum, max_dd_count, worst_drawdown
+        ) VALUES (
+            NEW.strategy_id, 1, NEW.result = 'WIN', NEW.result = 'LOSS',
+            NEW.pnl, NEW.net_pnl, NEW.net_pnl IS NOT NULL, NEW.commission,
+            NEW.net_pnl, NEW.net_pnl,
+            NEW.max_unrealized_loss, NEW.max_unrealized_loss IS NOT NULL, NEW.max_unrealized_loss
+        )
+        ON CONFLICT(strategy_id) DO UPDATE SET
+            total_trades = total_trades + 1,
+            wins = wins + excluded.wins,
+            losses = losses + excluded.losses,
+            gross_pnl = {gross_pnl},
+            net_pnl = {net_pnl},
+            net_pnl_count = net_pnl_count + excluded.net_pnl_count,
+            commission = {commission},
+            best_trade = {best_trade},
+            worst_trade = {worst_trade},
+            max_dd_sum = {max_dd_sum},
+            max_dd_count = max_dd_count + excluded.max_dd_count,
+            worst_drawdown = {worst_drawdown};
+    END
+""".format(
+    gross_pnl=_STATS_ADD_SQL.format(col="gross_pnl"),
+    net_pnl=_STATS_ADD_SQL.format(col="net_pnl"),
+    commission=_STATS_ADD_SQL.format(col="commission"),
+    best_trade=_STATS_EXTREME_SQL.format(fn="MAX", col="best_trade"),
+    worst_trade=_STATS_EXTREME_SQL.format(fn="MIN", col="worst_trade"),
+    max_dd_sum=_STATS_ADD_SQL.format(col="max_dd_sum"),
+    worst_drawdown=_STATS_EXTREME_SQL.format(fn="MIN", col="worst_drawdown"),
+)
+
+# Re-closing (or reopening) a closed trade can lower a best/worst value, which
+# cannot be undone incrementally, so that strategy's row is re-aggregated
+_STATS_RECLOSE_TRIGGER_SQL = """
+    CREATE TRIGGER IF NOT EXISTS trg_trades_reclose_stats
+    AFTER UPDATE OF status ON trades
+    WHEN OLD.status = 'CLOSED'
+    BEGIN
+        DELETE FROM strategy_stats WHERE strategy_id = NEW.strategy_id;
+        {aggregate};
+    END
+""".format(
+    aggregate=_STATS_AGGREGATE_SQL.format(where="strategy_id = NEW.strategy_id AND status = 'CLOSED'").strip(),
+)
+
+_STATS_SUMMARY_SQL = """
+    SELECT 
+        SUM(total_trades) as total_trades,
+        SUM(wins) as wins,
+        SUM(losses) as losses,
+        SUM(gross_pnl) as total_gross_pnl,
+        SUM(net_pnl) as total_net_pnl,
+        SUM(net_pnl_count) as net_pnl_count,
+        SUM(commission) as total_commission,
+        MAX(best_trade) as best_trade,
+        MIN(worst_trade) as worst_trade,
+        SUM(max_dd_sum) as max_dd_sum,
+        SUM(max_dd_count) as max_dd_count,
+        MIN(worst_drawdown) as worst_drawdown
+    FROM strategy_stats 
+    {where}
+"""
+_STATS_SUMMARY_ALL_SQL = _STATS_SUMMARY_SQL.format(where="")
+_STATS_SUMMARY_ONE_SQL = _STATS_SUMMARY_SQL.format(where="WHERE strategy_id = ?")
+
+# Base schema, run by _init_db as one script. Indexes and triggers on the
+# generated columns are in _SCHEMA_INDEXES_SQL, run after the migrations that
+# may add those columns.
+_SCHEMA_SQL = f"""
+    -- ORDERS TABLE
+    CREATE TABLE IF NOT EXISTS orders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        strategy_id TEXT NOT NULL,
+        instrument_id TEXT NOT NULL,
+        exchange_order_id TEXT UNIQUE,
+        client_order_id TEXT,
+        trade_id TEXT,
+        trade_type TEXT NOT NULL,
+        trade_direction TEXT NOT NULL,
+        order_side TEXT NOT NULL,
+        order_type TEXT NOT NULL,
+        quantity REAL NOT NULL,
+        price_limit REAL,
+        status TEXT NOT NULL DEFAULT 'SUBMITTED',
+        submitted_time TEXT NOT NULL,
+        filled_time TEXT,
+        filled_quantity REAL DEFAULT 0,
+        filled_price REAL,
+        commission REAL DEFAULT 0.0,
+        raw_data BLOB,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+
+    -- TRADES TABLE
+    CREATE TABLE IF NOT EXISTS trades (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        trade_id TEXT UNIQUE NOT NULL,
+        strategy_id TEXT NOT NULL,
+        instrument_id TEXT NOT NULL,
+        trade_type TEXT NOT NULL,
+        entry_reason TEXT,
+        entry_target_price REAL,
+        entry_stop_loss REAL,
+        strikes TEXT,
+        expiration TEXT,
+        legs TEXT,
+        strategy_config TEXT,
+        entry_time TEXT NOT NULL,
+        exit_time TEXT,
+        duration_seconds INTEGER,
+        entry_price REAL NOT NULL,
+        exit_price REAL,
+        quantity REAL NOT NULL,
+        direction TEXT NOT NULL,
+        pnl REAL,
+        commission REAL DEFAULT 0.0,
+        net_pnl REAL,
+        {_RESULT_COLUMN_DEF},
+        {_ENTRY_TS_COLUMN_DEF},
+        {_EXIT_TS_COLUMN_DEF},
+        max_profit REAL,
+        max_loss REAL,
+        max_unrealized_profit REAL DEFAULT 0.0,
+        max_unrealized_loss REAL DEFAULT 0.0,
+        max_unrealized_loss_time TEXT,
+        entry_premium_per_contract REAL,
+        pnl_snapshots TEXT,
+        status TEXT NOT NULL DEFAULT 'OPEN',
+        exit_reason TEXT,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+
+    -- STRATEGY STATS ROLLUP (maintained by triggers on close, refreshed on reconcile/delete)
+    CREATE TABLE IF NOT EXISTS strategy_stats (
+        strategy_id TEXT PRIMARY KEY,
+        total_trades INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0,
+        losses INTEGER NOT NULL DEFAULT 0,
+        gross_pnl REAL,
+        net_pnl REAL,
+        net_pnl_count INTEGER NOT NULL DEFAULT 0,
+        commission REAL,
+        best_trade REAL,
+        worst_trade REAL,
+        max_dd_sum REAL,
+        max_dd_count INTEGER NOT NULL DEFAULT 0,
+        worst_drawdown REAL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_orders_strategy ON orders(strategy_id);
+    -- Orders of a trade, and its ENTRY order alone (update_trade_quantity)
+    CREATE INDEX IF NOT EXISTS idx_orders_trade_dir ON orders(trade_id, trade_direction);
+    CREATE INDEX IF NOT EXISTS idx_orders_filled_time ON orders(filled_time);
+
+    -- Orders go with their trade, as ON DELETE CASCADE would. A trigger rather
+    -- than a foreign key: orders may reference a trade that is not recorded
+    -- (yet), and adding a constraint to existing tables means rebuilding them
+    CREATE TRIGGER IF NOT EXISTS trg_trades_delete_orders
+    AFTER DELETE ON trades
+    BEGIN
+        DELETE FROM orders WHERE trade_id = OLD.trade_id;
+    END;
+"""
+
+_SCHEMA_INDEXES_SQL = f"""
+    CREATE INDEX IF NOT EXISTS idx_trades_strategy_entry ON trades(strategy_id, entry_ts DESC);
+    CREATE INDEX IF NOT EXISTS idx_trades_entry_ts ON trades(entry_ts);
+    -- Closed trades per strategy, already in entry order
+    -- (drawdown analysis, stats rollup refresh)
+    CREATE INDEX IF NOT EXISTS idx_trades_strategy_status_entry
+        ON trades(strategy_id, status, entry_ts DESC);
+    CREATE INDEX IF NOT EXISTS idx_trades_strategy_result ON trades(strategy_id, result)
+        WHERE status = 'CLOSED';
+    -- Open trades are a handful of rows; this keeps get_open_trades
+    -- (filtered or not) off the full history
+    CREATE INDEX IF NOT EXISTS idx_trades_open ON trades(strategy_id, entry_ts)
+        WHERE status = 'OPEN';
+    -- Keep the stats rollup in step with closes (reads the generated result)
+    {_STATS_CLOSE_TRIGGER_SQL.strip()};
+    {_STATS_RECLOSE_TRIGGER_SQL.strip()};
+"""
+
+_LIST_TRADES_SQL = """
+    SELECT 
+        id, trade_id, strategy_id, instrument_id, trade_type,
+        entry_time, exit_time, duration_seconds,
+        entry_price, exit_price, quantity, direction,
+        pnl, commission, net_pnl, result,
+        max_unrealized_profit AS max_profit,
+        max_unrealized_loss AS max_drawdown,
+        strikes, exit_reason, status
+    FROM trades 
+    {where}
+    ORDER BY entry_ts DESC
+    LIMIT ?
+"""
+_LIST_TRADES_ALL_SQL = _LIST_TRADES_SQL.format(where="")
+_LIST_TRADES_ONE_SQL = _LIST_TRADES_SQL.format(where="WHERE strategy_id = ?")
+
+
+# Labels of the generated trades.result column, indexed by sign(net_pnl) + 1
+_RESULT_LABELS = ("LOSS", "BREAKEVEN", "WIN")
+
+
+def _result_label(net_pnl: float) -> str:
+    """Classify a net P&L the same way as the generated trades.result column."""
+    return _RESULT_LABELS[(net_pnl > 0) - (net_pnl < 0) + 1]
+
+
+def _utc_iso(epoch: float) -> str:
+    """Format an epoch timestamp like datetime.utcnow().isoformat() + "Z"."""
+    return datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+
+
+def _sql_now() -> str:
+    """Current UTC time in SQLite's datetime('now') format."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+
+
+def _is_market_hours() -> bool:
+    """Check if US equity market is open (Mon-Fri 9:30 AM - 4:00 PM ET)."""
+    now_et = datetime.now(MARKET_TZ)
+    return now_et.weekday() < 5 and dtime(9, 30) <= now_et.time() < dtime(16, 0)
+
 
 class TradingDataService:
     """
@@ -60,110 +545,287 @@ class TradingDataService:
     
     def __init__(self, db_path: str = "data/trading.db"):
         self.db_path = db_path
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self._init_db()
+        
+        # One long-lived connection per thread and file (see _get_connection)
+        self._db_key = os.path.abspath(db_path)
+        self._pool = _pools.setdefault(self._db_key, {
+            "local": threading.local(),
+            "connections": [],
+            "lock": threading.Lock(),
+            "refs": 0,
+        })
+        with self._pool["lock"]:
+            self._pool["refs"] += 1
+        self._closed = False
+        self._write_lock = _write_locks.setdefault(self._db_key, threading.RLock())
         
         # Active trade tracking (for drawdown updates)
         self._active_trades: Dict[str, Dict[str, Any]] = {}
+        # Trades whose max profit / drawdown changed since the last flush
+        self._dirty_trades: set = set()
+        self._dirty_lock = threading.Lock()
+        _services.add(self)
+        
+        with _initialized_lock:
+            if self._db_key not in _initialized_paths:
+                os.makedirs(os.path.dirname(self._db_key), exist_ok=True)
+                if self._init_db():
+                    _initialized_paths.add(self._db_key)
+        self._start_checkpointer()
     
     @contextmanager
-    def _get_connection(self):
-        """Context manager for database connections."""
-        conn = None
+    def _get_connection(self, write: bool = False):
+        """
+        Context manager yielding this thread's database connection.
+        
+        Connections are opened once per thread and database file and reused
+        by every service instance on that file, keeping SQLite's page and
+        statement caches warm. Anything left uncommitted on exit is
+        rolled back, as closing a per-call connection used to do.
+        
+        Args:
+            write: Hold the database's writer lock for the block. Readers
+                never take it; WAL lets them run alongside the writer.
+        """
+        local = self._pool["local"]
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            local.conn = conn
+        if write:
+            self._write_lock.acquire()
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
             yield conn
         finally:
-            if conn:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            finally:
+                if write:
+                    self._write_lock.release()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection and apply per-connection PRAGMAs."""
+        # check_same_thread=False only so close() can run from the exit handler
+        # Long-lived connections keep hot statements compiled; size the
+        # statement cache to hold every distinct query this service issues
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+        # Under WAL, NORMAL skips the fsync on each commit: the database stays
+        # consistent after a crash, but the last commits before a power loss
+        # may be rolled back
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")  # ~64 MB page cache
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")  # Reads via mmap instead of pread
+        # Checkpoints are run by the background checkpointer only
+        conn.execute("PRAGMA wal_autocheckpoint=0")
+        # PASSIVE checkpoints in market hours leave the WAL file at its peak
+        # size; this shrinks it back when the WAL is next reset
+        conn.execute(f"PRAGMA journal_size_limit={JOURNAL_SIZE_LIMIT}")
+        with self._pool["lock"]:
+            self._pool["connections"].append(conn)
+        return conn
+    
+    def close(self):
+        """
+        Flush queued metrics and release this service's hold on the database.
+        
+        Connections are shared with the other services on the same file, so
+        only the calling thread's connection is closed while any of them is
+        still open. The last service to close stops the maintenance thread
+        and then closes every pooled connection.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self.flush_trade_metrics()
+        _services.discard(self)
+        
+        pool = self._pool
+        with pool["lock"]:
+            pool["refs"] -= 1
+            last = pool["refs"] <= 0
+            conn = None
+            if not last:
+                conn = getattr(pool["local"], "conn", None)
+                if conn is not None:
+                    pool["local"].conn = None
+                    pool["connections"].remove(conn)
+        if last:
+            _release_pool(self._db_key)
+        elif conn is not None:
+            try:
                 conn.close()
+            except Exception as e:
+                logger.warning(f"Failed to close trading database connection: {e}")
     
-    def _init_db(self):
-        """Initialize database schema."""
+    def _init_db(self) -> bool:
+        """Initialize database schema. Returns True on success."""
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
+            with self._get_connection(write=True) as conn:
+                # Deleted trades leave free pages; with incremental auto-vacuum
+                # the maintenance thread hands them back to the OS. Only takes
+                # effect on a new file (existing files are converted below)
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                # WAL lets readers run during writes; the mode persists in the file.
+                # SQLite keeps its own mode where WAL is unavailable (":memory:")
+                journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+                if journal_mode != "wal":
+                    logger.warning(f"Trading database {self.db_path} is using journal_mode={journal_mode}, not WAL")
                 
-                # ORDERS TABLE
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS orders (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        strategy_id TEXT NOT NULL,
-                        instrument_id TEXT NOT NULL,
-                        exchange_order_id TEXT UNIQUE,
-                        client_order_id TEXT,
-                        trade_id TEXT,
-                        trade_type TEXT NOT NULL,
-                        trade_direction TEXT NOT NULL,
-                        order_side TEXT NOT NULL,
-                        order_type TEXT NOT NULL,
-                        quantity REAL NOT NULL,
-                        price_limit REAL,
-                        status TEXT NOT NULL DEFAULT 'SUBMITTED',
-                        submitted_time TEXT NOT NULL,
-                        filled_time TEXT,
-                        filled_quantity REAL DEFAULT 0,
-                        filled_price REAL,
-                        commission REAL DEFAULT 0.0,
-                        raw_data TEXT,
-                        created_at TEXT NOT NULL DEFAULT (datetime('now')),
-                        updated_at TEXT NOT NULL DEFAULT (datetime('now'))
-                    )
-                """)
+                # Tables and base indexes in one parse
+                conn.executescript(_SCHEMA_SQL)
+                cursor = conn.cursor()
                 
-                # TRADES TABLE
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS trades (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        trade_id TEXT UNIQUE NOT NULL,
-                        strategy_id TEXT NOT NULL,
-                        instrument_id TEXT NOT NULL,
-                        trade_type TEXT NOT NULL,
-                        entry_reason TEXT,
-                        entry_target_price REAL,
-                        entry_stop_loss REAL,
-                        strikes TEXT,
-                        expiration TEXT,
-                        legs TEXT,
-                        strategy_config TEXT,
-                        entry_time TEXT NOT NULL,
-                        exit_time TEXT,
-                        duration_seconds INTEGER,
-                        entry_price REAL NOT NULL,
-                        exit_price REAL,
-                        quantity REAL NOT NULL,
-                        direction TEXT NOT NULL,
-                        pnl REAL,
-                        commission REAL DEFAULT 0.0,
-                        net_pnl REAL,
-                        result TEXT,
-                        max_profit REAL,
-                        max_loss REAL,
-                        max_unrealized_profit REAL DEFAULT 0.0,
-                        max_unrealized_loss REAL DEFAULT 0.0,
-                        max_unrealized_loss_time TEXT,
-                        entry_premium_per_contract REAL,
-                        pnl_snapshots TEXT,
-                        status TEXT NOT NULL DEFAULT 'OPEN',
-                        exit_reason TEXT,
-                        created_at TEXT NOT NULL DEFAULT (datetime('now')),
-                        updated_at TEXT NOT NULL DEFAULT (datetime('now'))
-                    )
-                """)
+                # One-off schema migrations, tracked in PRAGMA user_version
+                version = cursor.execute("PRAGMA user_version").fetchone()[0]
+                if version < 1:
+                    # Superseded by idx_trades_strategy_entry (same leading column)
+                    cursor.execute("DROP INDEX IF EXISTS idx_trades_strategy")
+                    cursor.execute("ANALYZE trades")
+                if version < 2:
+                    # Backfill the rollup from existing closed trades
+                    self._refresh_strategy_stats(conn)
+                if version < 3:
+                    # Replace the stored result column with the generated one
+                    result_col = [c for c in cursor.execute("PRAGMA table_xinfo(trades)") if c["name"] == "result"]
+                    if result_col and result_col[0]["hidden"] == 0:
+                        cursor.execute("ALTER TABLE trades DROP COLUMN result")
+                        cursor.execute(f"ALTER TABLE trades ADD COLUMN {_RESULT_COLUMN_DEF}")
+                        self._refresh_strategy_stats(conn)
+                if version < 4:
+                    # Entry-time indexes move from the ISO text to entry_ts
+                    cursor.execute("DROP INDEX IF EXISTS idx_trades_strategy_entry")
+                    cursor.execute("DROP INDEX IF EXISTS idx_trades_entry_time")
+                    columns = {c["name"] for c in cursor.execute("PRAGMA table_xinfo(trades)")}
+                    if "entry_ts" not in columns:
+                        cursor.execute(f"ALTER TABLE trades ADD COLUMN {_ENTRY_TS_COLUMN_DEF}")
+                    if "exit_ts" not in columns:
+                        cursor.execute(f"ALTER TABLE trades ADD COLUMN {_EXIT_TS_COLUMN_DEF}")
+                if version < 5:
+                    # Status lookups are served by idx_trades_strategy_status_entry
+                    cursor.execute("DROP INDEX IF EXISTS idx_trades_status")
+                if version < 6:
+                    # Superseded by idx_orders_trade_dir (same leading column)
+                    cursor.execute("DROP INDEX IF EXISTS idx_orders_trade_id")
+                target_version = SCHEMA_VERSION
+                if version < 7:
+                    # An existing file only switches to incremental auto-vacuum
+                    # through a full VACUUM, which is too slow and disk-hungry
+                    # for startup; it is left to enable_incremental_vacuum()
+                    # and the version stays at 6 until that has run
+                    if cursor.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                        target_version = 6
+                        logger.warning(
+                            f"Trading database {self.db_path} has no incremental auto-vacuum; "
+                            f"run scripts/enable_incremental_vacuum.py while the backend is stopped"
+                        )
+                if version < target_version:
+                    cursor.execute(f"PRAGMA user_version = {target_version}")
                 
-                # Indexes
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_strategy ON orders(strategy_id)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_trade_id ON orders(trade_id)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_filled_time ON orders(filled_time)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_strategy ON trades(strategy_id)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_entry_time ON trades(entry_time)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status)")
+                # Need the generated columns, so created after migrations
+                conn.executescript(_SCHEMA_INDEXES_SQL)
                 
                 conn.commit()
                 logger.info(f"Trading database initialized at {self.db_path}")
+            return True
                 
         except Exception as e:
             logger.error(f"Failed to initialize trading database: {e}")
+            return False
+    
+    def enable_incremental_vacuum(self) -> bool:
+        """
+        Convert an existing database file to incremental auto-vacuum.
+        
+        Rewrites the whole file with VACUUM (needs about twice its size in
+        free disk space), so it is a maintenance step for when nothing
+        else is using the database, not something run at startup.
+        
+        Returns:
+            True if the file now uses incremental auto-vacuum
+        """
+        try:
+            self.flush_trade_metrics()
+            with self._get_connection(write=True) as conn:
+                if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                    # Cannot run inside a transaction
+                    conn.commit()
+                    conn.execute("VACUUM")
+                if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                    logger.error(f"Incremental auto-vacuum not enabled on {self.db_path}")
+                    return False
+                if conn.execute("PRAGMA user_version").fetchone()[0] < 7:
+                    conn.execute("PRAGMA user_version = 7")
+                conn.commit()
+            logger.info(f"Incremental auto-vacuum enabled on {self.db_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to enable incremental auto-vacuum on {self.db_path}: {e}")
+            return False
+    
+    def _start_checkpointer(self):
+        """Start the background maintenance thread for this database file."""
+        with _checkpointers_lock:
+            if self._db_key in _checkpointers:
+                return
+            stop = threading.Event()
+            worker = threading.Thread(
+                target=self._checkpoint_worker,
+                args=(stop,),
+                daemon=True,
+                name="TradingDBMaintenance",
+            )
+            _checkpointers[self._db_key] = (worker, stop)
+            worker.start()
+    
+    def _checkpoint_worker(self, stop: threading.Event):
+        """
+        Periodically flush trade metrics, checkpoint the WAL and refresh
+        planner statistics.
+        
+        Every METRICS_FLUSH_INTERVAL seconds, writes the queued trade metrics
+        of every service on this file. Every CHECKPOINT_INTERVAL seconds,
+        checkpoints the WAL: PASSIVE during market hours (never blocks
+        writers), TRUNCATE outside them to reset the WAL file to zero bytes.
+        Every OPTIMIZE_INTERVAL seconds also runs PRAGMA optimize so query
+        plans track table growth.
+        
+        Runs until stop is set by the last service on the file closing.
+        """
+        last_checkpoint = last_optimize = time.monotonic()
+        while not stop.wait(min(METRICS_FLUSH_INTERVAL, CHECKPOINT_INTERVAL)):
+            for service in list(_services):
+                if service._db_key == self._db_key:
+                    service.flush_trade_metrics()
+            
+            if time.monotonic() - last_checkpoint < CHECKPOINT_INTERVAL:
+                continue
+            last_checkpoint = time.monotonic()
+            mode = "PASSIVE" if _is_market_hours() else "TRUNCATE"
+            try:
+                with self._get_connection() as conn:
+                    conn.execute(f"PRAGMA wal_checkpoint({mode})")
+            except Exception as e:
+                logger.warning(f"WAL checkpoint ({mode}) failed: {e}")
+            
+            if time.monotonic() - last_optimize >= OPTIMIZE_INTERVAL:
+                last_optimize = time.monotonic()
+                try:
+                    with self._get_connection(write=True) as conn:
+                        conn.execute("PRAGMA optimize")
+                        # Stepped to completion by executescript; execute()
+                        # would free a single page
+                        conn.executescript(f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES})")
+                except Exception as e:
+                    logger.warning(f"PRAGMA optimize / incremental_vacuum failed: {e}")
     
     # =========================================================================
     # TRADE LIFECYCLE
@@ -189,67 +851,106 @@ class TradingDataService:
         max_profit: Optional[float] = None,
         max_loss: Optional[float] = None,
         entry_premium_per_contract: Optional[float] = None,
+        order: Optional[Dict[str, Any]] = None,
     ) -> Optional[str]:
         """
         Create a new trade record when entering a position.
         
+        Args:
+            order: Optional entry order execution, as record_order() keyword
+                arguments (trade_id defaults to this trade). It is written in
+                the same transaction, so the fill costs one commit, not two.
+        
         Returns:
-            trade_id if successful, None if failed
+            trade_id if successful, None if failed (nothing is written)
         """
         try:
-            entry_time = entry_time or datetime.utcnow().isoformat() + "Z"
+            row = self._trade_row(
+                trade_id, strategy_id, instrument_id, trade_type,
+                entry_price, quantity, direction, entry_time,
+                entry_reason, entry_target_price, entry_stop_loss,
+                strikes, expiration, legs, strategy_config,
+                max_profit, max_loss, entry_premium_per_contract,
+            )
+            order_row = self._order_row(**{"trade_id": trade_id, **order}) if order else None
+            order_id = None
             
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    INSERT INTO trades (
-                        trade_id, strategy_id, instrument_id, trade_type,
-                        entry_price, quantity, direction, entry_time,
-                        entry_reason, entry_target_price, entry_stop_loss,
-                        strikes, expiration, legs, strategy_config,
-                        max_profit, max_loss, entry_premium_per_contract,
-                        status
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'OPEN')
-                """, (
-                    trade_id,
-                    strategy_id,
-                    instrument_id,
-                    trade_type,
-                    self._r2(entry_price),
-                    self._r2(quantity),
-                    direction,
-                    entry_time,
-                    self._safe_json(entry_reason),
-                    self._r2(entry_target_price),
-                    self._r2(entry_stop_loss),
-                    self._safe_json(strikes),
-                    expiration,
-                    self._safe_json(legs),
-                    self._safe_json(strategy_config),
-                    self._r2(max_profit),
-                    self._r2(max_loss),
-                    self._r2(entry_premium_per_contract),
-                ))
-                
+            with self._get_connection(write=True) as conn:
+                if order_row is None:
+                    conn.execute(_INSERT_TRADE_SQL, row)
+                else:
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.execute(_INSERT_TRADE_SQL, row)
+                    order_id = self._insert_order_row(conn, order_row, order)
                 conn.commit()
             
+            if order_id is not None:
+                logger.info(f"Order recorded: #{order_id} | {order['trade_direction']} | {order['order_side']} | {order['status']}")
+            
             # Track for live drawdown updates
-            self._active_trades[trade_id] = {
-                "entry_stop_loss": entry_stop_loss,
-                "max_unrealized_profit": 0.0,
-                "max_unrealized_loss": 0.0,
-                "max_dd_time": None,
-                "pnl_snapshots": [],
-            }
+            self._track_new_trade(row)
             
-            logger.info(f"Trade started: {trade_id} | {trade_type} | {direction} | Entry: {entry_price}")
+            if logger.isEnabledFor(logging.INFO):
+                parts = [trade_id, trade_type, direction, f"Entry: {entry_price}"]
+                if strikes:
+                    parts.append(f"Strikes: {', '.join(map(str, strikes))}")
+                if entry_premium_per_contract is not None:
+                    parts.append(f"Premium: ${entry_premium_per_contract:.2f}")
+                logger.info("Trade started: " + " | ".join(parts))
             return trade_id
             
         except Exception as e:
             logger.error(f"Failed to start trade {trade_id}: {e}")
             return None
     
+    def start_trades_bulk(self, trades: List[Dict[str, Any]]) -> List[str]:
+        """
+        Create several trade records in a single transaction.
+        
+        Each item takes the same keyword arguments as start_trade(). All rows
+        are written with one executemany and one commit, so opening N trades
+        together costs a single commit instead of N. Entry orders given as
+        `order` are written in the same transaction.
+        
+        Returns:
+            trade_ids written, or an empty list if the batch failed
+        """
+        if not trades:
+            return []
+        
+        try:
+            # Materialized rather than streamed into executemany: a generator
+            # would run the JSON encoding in _trade_row under the writer lock,
+            # and the rows seed in-memory tracking once committed
+            rows = []
+            orders = []
+            for trade in trades:
+                order = trade.get("order")
+                row = self._trade_row(**{k: v for k, v in trade.items() if k != "order"})
+                rows.append(row)
+                if order:
+                    orders.append((self._order_row(**{"trade_id": row[0], **order}), order))
+            
+            with self._get_connection(write=True) as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(_INSERT_TRADE_SQL, rows)
+                order_ids = [self._insert_order_row(conn, order_row, order) for order_row, order in orders]
+                conn.commit()
+            
+            self._log_orders_recorded(order_ids, orders)
+            
+            trade_ids = []
+            for row in rows:
+                self._track_new_trade(row)
+                trade_ids.append(row[0])
+            
+            logger.info(f"Trades started (bulk): {len(trade_ids)}")
+            return trade_ids
+            
+        except Exception as e:
+            logger.error(f"Failed to start {len(trades)} trades in bulk: {e}")
+            return []
+    
     def update_trade_metrics(
         self,
         trade_id: str,
@@ -278,7 +979,9 @@ class TradingDataService:
                 logger.warning(f"Trade {trade_id} not found for metrics update")
                 return False
             
-            timestamp = timestamp or datetime.utcnow().isoformat() + "Z"
+            # Per-tick snapshots keep the raw epoch; it is only formatted when
+            # it becomes the max drawdown time or the snapshots are serialized
+            ts = timestamp or time.time()
             updates_needed = False
             
             # Round current_pnl before tracking to avoid float precision noise
@@ -292,21 +995,17 @@ class TradingDataService:
             # Update max drawdown (most negative)
             if current_pnl < trade_data["max_unrealized_loss"]:
                 trade_data["max_unrealized_loss"] = current_pnl
-                trade_data["max_dd_time"] = timestamp
+                trade_data["max_dd_time"] = timestamp or _utc_iso(ts)
                 updates_needed = True
-                logger.debug(f"Trade {trade_id} new max drawdown: ${current_pnl:.2f}")
-            
-            # Add P&L snapshot (every call, for curve analysis)
-            trade_data["pnl_snapshots"].append({
-                "ts": timestamp,
-                "pnl": round(current_pnl, 2)
-            })
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Trade {trade_id} new max drawdown: ${current_pnl:.2f}")
             
-            # Limit snapshots to last 1000 to prevent memory bloat
-            if len(trade_data["pnl_snapshots"]) > 1000:
-                trade_data["pnl_snapshots"] = trade_data["pnl_snapshots"][-1000:]
+            # Add P&L snapshot (every call, for curve analysis); the bounded
+            # deques drop the oldest entry once MAX_PNL_SNAPSHOTS is reached
+            trade_data["snapshot_ts"].append(ts)
+            trade_data["snapshot_pnl"].append(current_pnl)
             
-            # Persist to DB (throttle to every 10th update for performance)
+            # Queue for the next batched metrics flush
             if updates_needed:
                 self._persist_trade_metrics(trade_id, trade_data)
             
@@ -316,6 +1015,81 @@ class TradingDataService:
             logger.error(f"Failed to update trade metrics {trade_id}: {e}")
             return False
     
+    def update_trade_metrics_bulk(
+        self,
+        trade_id: str,
+        pnls: List[float],
+        timestamps: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Apply a batch of P&L observations in one pass (backtest / replay).
+        
+        Equivalent to calling update_trade_metrics() for each value, but the
+        max profit / max drawdown are reduced once and the metrics are
+        queued at most once.
+        
+        Args:
+            trade_id: Trade identifier
+            pnls: Unrealized P&L values in chronological order
+            timestamps: Optional timestamps matching pnls one-to-one, defaults to now
+            
+        Returns:
+            True if update successful (False means nothing was applied)
+        """
+        try:
+            if timestamps is not None and len(timestamps) != len(pnls):
+                logger.warning(
+                    f"Bulk metrics update for {trade_id} has {len(pnls)} P&L values "
+                    f"but {len(timestamps)} timestamps; ignored"
+                )
+                return False
+            
+            if trade_id not in self._active_trades:
+                self._load_active_trade(trade_id)
+            
+            trade_data = self._active_trades.get(trade_id)
+            if not trade_data:
+                logger.warning(f"Trade {trade_id} not found for metrics update")
+                return False
+            
+            if not pnls:
+                return True
+            
+            # Same rounding and timestamp defaults as update_trade_metrics()
+            rounded = [self._r2(pnl) for pnl in pnls]
+            now = time.time()
+            stamps = [now] * len(rounded) if timestamps is None else [ts or now for ts in timestamps]
+            
+            updates_needed = False
+            
+            batch_max = max(rounded)
+            if batch_max > trade_data["max_unrealized_profit"]:
+                trade_data["max_unrealized_profit"] = batch_max
+                updates_needed = True
+            
+            # First occurrence of the minimum, as the per-tick path only moves
+            # max_dd_time on a strictly lower value
+            min_idx = min(range(len(rounded)), key=rounded.__getitem__)
+            if rounded[min_idx] < trade_data["max_unrealized_loss"]:
+                trade_data["max_unrealized_loss"] = rounded[min_idx]
+                max_dd_time = stamps[min_idx]
+                trade_data["max_dd_time"] = max_dd_time if isinstance(max_dd_time, str) else _utc_iso(max_dd_time)
+                updates_needed = True
+            
+            # Keep only the most recent snapshots, same as the per-tick path
+            tail = max(0, len(rounded) - MAX_PNL_SNAPSHOTS)
+            trade_data["snapshot_ts"].extend(stamps[tail:])
+            trade_data["snapshot_pnl"].extend(rounded[tail:])
+            
+            if updates_needed:
+                self._persist_trade_metrics(trade_id, trade_data)
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to bulk update trade metrics {trade_id}: {e}")
+            return False
+    
     def close_trade(
         self,
         trade_id: str,
@@ -323,6 +1097,7 @@ class TradingDataService:
         exit_reason: str,
         exit_time: Optional[str] = None,
         commission: Optional[float] = None,
+        order: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """
         Close a trade and calculate final P&L.
@@ -333,112 +1108,115 @@ class TradingDataService:
             exit_reason: STOP_LOSS, TAKE_PROFIT, MANUAL, EOD, EXPIRY
             exit_time: Optional timestamp
             commission: Total commission for the trade
+            order: Optional exit order execution, as record_order() keyword
+                arguments (trade_id defaults to this trade). It is written in
+                the same transaction as the close.
             
         Returns:
-            True if close successful
+            True if close successful (False means nothing was written)
         """
         try:
-            exit_time = exit_time or datetime.utcnow().isoformat() + "Z"
-            trade_data = self._active_trades.get(trade_id, {})
+            # Entry fields come from in-memory tracking; only trades opened
+            # before a restart (or by another process) are read from the DB
+            if trade_id not in self._active_trades:
+                self._load_active_trade(trade_id)
+            trade_data = self._active_trades.get(trade_id)
+            if not trade_data:
+                logger.error(f"Trade {trade_id} not found for closing")
+                return False
             
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Get trade entry data
-                cursor.execute(
-                    "SELECT entry_price, quantity, entry_time, entry_stop_loss, max_unrealized_loss_time "
-                    "FROM trades WHERE trade_id = ?",
-                    (trade_id,)
-                )
-                row = cursor.fetchone()
-                
-                if not row:
+            strategy_id = trade_data["strategy_id"]
+            row, pnl = self._close_row(trade_id, trade_data, exit_price, exit_reason, exit_time, commission)
+            order_row = self._order_row(**{"trade_id": trade_id, **order}) if order else None
+            order_id = None
+            
+            with self._get_connection(write=True) as conn:
+                # Take SQLite's write lock up front (no deferred-lock upgrade)
+                conn.execute("BEGIN IMMEDIATE")
+                if conn.execute(_CLOSE_TRADE_SQL, row).rowcount == 0:
+                    # Deleted since it was loaded
+                    self._active_trades.pop(trade_id, None)
                     logger.error(f"Trade {trade_id} not found for closing")
                     return False
-                
-                entry_price = row["entry_price"]
-                quantity = row["quantity"]
-                entry_time = row["entry_time"]
-                entry_stop_loss = row["entry_stop_loss"]
-                max_dd_time = row["max_unrealized_loss_time"] or trade_data.get("max_dd_time")
-                
-                # Calculate P&L
-                # For credit spreads: entry is negative (credit), exit is negative (debit to close)
-                # P&L = (exit_price - entry_price) * multiplier * quantity
-                # For credit spread LONG: entry=-0.95, exit=-0.45 → pnl = (-0.45 - (-0.95)) * 100 * 2 = +100
-                pnl = (exit_price - entry_price) * 100 * quantity
-                
-                # Calculate duration
-                try:
-                    entry_dt = datetime.fromisoformat(entry_time.replace("Z", "+00:00"))
-                    exit_dt = datetime.fromisoformat(exit_time.replace("Z", "+00:00"))
-                    duration_seconds = int((exit_dt - entry_dt).total_seconds())
-                except:
-                    duration_seconds = None
-                
-
-
-                # Commission
-                total_commission = commission or 0.0
-                net_pnl = pnl - total_commission
-                
-                # Result
-                if net_pnl > 0:
-                    result = "WIN"
-                elif net_pnl < 0:
-                    result = "LOSS"
-                else:
-                    result = "BREAKEVEN"
-                
-                # Update trade
-                cursor.execute("""
-                    UPDATE trades SET
-                        exit_time = ?,
-                        exit_price = ?,
-                        exit_reason = ?,
-                        duration_seconds = ?,
-                        pnl = ?,
-                        commission = ?,
-                        net_pnl = ?,
-                        result = ?,
-                        max_unrealized_profit = ?,
-                        max_unrealized_loss = ?,
-                        max_unrealized_loss_time = ?,
-                        pnl_snapshots = ?,
-                        status = 'CLOSED',
-                        updated_at = datetime('now')
-                    WHERE trade_id = ?
-                """, (
-                    exit_time,
-                    self._r2(exit_price),
-                    exit_reason,
-                    duration_seconds,
-                    self._r2(pnl),
-                    self._r2(total_commission),
-                    self._r2(net_pnl),
-                    result,
-                    self._r2(trade_data.get("max_unrealized_profit", 0)),
-                    self._r2(trade_data.get("max_unrealized_loss", 0)),
-                    max_dd_time,
-                    self._safe_json(trade_data.get("pnl_snapshots", [])),
-                    trade_id,
-                ))
-                
+                if order_row is not None:
+                    order_id = self._insert_order_row(conn, order_row, order)
+                # strategy_stats is updated by the close triggers
                 conn.commit()
             
+            if order_id is not None:
+                logger.info(f"Order recorded: #{order_id} | {order['trade_direction']} | {order['order_side']} | {order['status']}")
+            
+            self._invalidate_stats_cache(strategy_id)
+            
             # Remove from active tracking
             self._active_trades.pop(trade_id, None)
             
-            logger.info(
-                f"Trade closed: {trade_id} | {exit_reason} | P&L: ${pnl:.2f} | "
-                f"Max DD: ${trade_data.get('max_unrealized_loss', 0):.2f} | Result: {result}"
-            )
+            self._log_trade_closed(trade_id, exit_reason, pnl, row[6], trade_data)
             return True
             
         except Exception as e:
             logger.error(f"Failed to close trade {trade_id}: {e}")
             return False
     
+    def close_trades_bulk(self, closes: List[Dict[str, Any]]) -> List[str]:
+        """
+        Close several trades in a single transaction.
+        
+        Each item takes the same keyword arguments as close_trade(). All rows
+        are written with one executemany; the close trigger folds each one
+        into the stats rollup. Exit orders given as `order` are written in the
+        same transaction.
+        
+        Returns:
+            trade_ids closed, or an empty list if the batch failed
+        """
+        if not closes:
+            return []
+        
+        try:
+            rows = []
+            orders = []
+            closed = []
+            for close in closes:
+                trade_id = close["trade_id"]
+                if trade_id not in self._active_trades:
+                    self._load_active_trade(trade_id)
+                trade_data = self._active_trades.get(trade_id)
+                if not trade_data:
+                    logger.error(f"Trade {trade_id} not found for closing")
+                    continue
+                order = close.get("order")
+                row, pnl = self._close_row(trade_data=trade_data, **{k: v for k, v in close.items() if k != "order"})
+                rows.append(row)
+                if order:
+                    orders.append((self._order_row(**{"trade_id": trade_id, **order}), order))
+                closed.append((trade_id, close["exit_reason"], pnl, row[6], trade_data))
+            if not rows:
+                return []
+            
+            strategy_ids = {trade_data["strategy_id"] for *_, trade_data in closed}
+            with self._get_connection(write=True) as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(_CLOSE_TRADE_SQL, rows)
+                order_ids = [self._insert_order_row(conn, order_row, order) for order_row, order in orders]
+                conn.commit()
+            
+            self._log_orders_recorded(order_ids, orders)
+            
+            for strategy_id in strategy_ids:
+                self._invalidate_stats_cache(strategy_id)
+            
+            trade_ids = []
+            for trade_id, exit_reason, pnl, net_pnl, trade_data in closed:
+                self._active_trades.pop(trade_id, None)
+                self._log_trade_closed(trade_id, exit_reason, pnl, net_pnl, trade_data)
+                trade_ids.append(trade_id)
+            return trade_ids
+            
+        except Exception as e:
+            logger.error(f"Failed to close {len(closes)} trades in bulk: {e}")
+            return []
+    
     # =========================================================================
     # ORDER RECORDING
     # =========================================================================
@@ -462,62 +1240,86 @@ class TradingDataService:
         filled_quantity: Optional[float] = None,
         filled_price: Optional[float] = None,
         commission: float = 0.0,
-        raw_data: Optional[Dict] = None,
+        raw_data: Optional[Union[Dict, str, bytes]] = None,
     ) -> Optional[int]:
         """
         Record an order execution.
         
+        raw_data is stored as UTF-8 JSON bytes; pre-serialized JSON (str or
+        bytes) is stored as-is rather than encoded a second time.
+        
         Returns:
             Order ID if successful, None if failed
         """
         try:
-            with self._get_connection() as conn:
+            # Serialize before taking the writer lock so other writers don't
+            # wait on JSON encoding
+            row = self._order_row(
+                strategy_id, instrument_id, trade_type, trade_direction,
+                order_side, order_type, quantity, status, submitted_time,
+                trade_id, exchange_order_id, client_order_id, price_limit,
+                filled_time, filled_quantity, filled_price, commission, raw_data,
+            )
+            
+            with self._get_connection(write=True) as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = None  # Plain tuples; results are read by position
+                cursor.execute(_INSERT_ORDER_SQL, row)
                 
-                cursor.execute("""
-                    INSERT INTO orders (
-                        strategy_id, instrument_id, exchange_order_id, client_order_id,
-                        trade_id, trade_type, trade_direction, order_side, order_type,
-                        quantity, price_limit, status, submitted_time,
-                        filled_time, filled_quantity, filled_price, commission, raw_data
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    strategy_id,
-                    instrument_id,
-                    exchange_order_id,
-                    client_order_id,
-                    trade_id,
-                    trade_type,
-                    trade_direction,
-                    order_side,
-                    order_type,
-                    self._r2(quantity),
-                    self._r2(price_limit),
-                    status,
-                    submitted_time,
-                    filled_time,
-                    self._r2(filled_quantity),
-                    self._r2(filled_price),
-                    self._r2(commission),
-                    self._safe_json(raw_data),
-                ))
-                
-                order_id = cursor.lastrowid
+                # The row must be read before commit, while the statement is live;
+                # no row means the exchange order id was already recorded
+                inserted = cursor.fetchone()
                 conn.commit()
-                
+            
+            if inserted is None:
+                logger.debug(f"Order already exists: {exchange_order_id}")
+                return None
+            
+            order_id = inserted[0]
             logger.info(f"Order recorded: #{order_id} | {trade_direction} | {order_side} | {status}")
             return order_id
             
         except sqlite3.IntegrityError as e:
-            if "UNIQUE constraint failed: orders.exchange_order_id" in str(e):
-                logger.debug(f"Order already exists: {exchange_order_id}")
-            else:
-                logger.error(f"Order integrity error: {e}")
+            logger.error(f"Order integrity error: {e}")
             return None
         except Exception as e:
             logger.error(f"Failed to record order: {e}")
             return None
     
+    def record_orders(self, orders: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """
+        Record several order executions in a single transaction.
+        
+        Each item takes the same keyword arguments as record_order(). The
+        orders share one commit, e.g. the entry and exit orders of a
+        backfilled trade. A duplicate exchange_order_id skips only that
+        order, as in record_order().
+        
+        Returns:
+            Order IDs in input order (None for skipped orders), or an empty
+            list if the batch failed
+        """
+        if not orders:
+            return []
+        
+        try:
+            rows = [self._order_row(**order) for order in orders]
+            order_ids: List[Optional[int]] = []
+            
+            with self._get_connection(write=True) as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                # One execute per row: executemany cannot return the new ids
+                for order, row in zip(orders, rows):
+                    order_ids.append(self._insert_order_row(conn, row, order))
+                conn.commit()
+            
+            logger.info(f"Orders recorded (bulk): {sum(i is not None for i in order_ids)}/{len(orders)}")
+            return order_ids
+            
+        except Exception as e:
+            logger.error(f"Failed to record {len(orders)} orders in bulk: {e}")
+            return []
+    
     def update_order(
         self,
         exchange_order_id: str,
@@ -529,7 +1331,7 @@ class TradingDataService:
     ) -> bool:
         """Update an existing order with fill details."""
         try:
-            with self._get_connection() as conn:
+            with self._get_connection(write=True) as conn:
                 cursor = conn.cursor()
                 
                 # Build dynamic update
@@ -620,33 +1422,62 @@ class TradingDataService:
             logger.error(f"Failed to get orders for trade {trade_id}: {e}")
             return []
     
-    def get_strategy_stats(self, strategy_id: str) -> Dict[str, Any]:
-        """Get aggregated statistics for a strategy."""
+    def get_trades(self, strategy_id: Optional[str] = None, limit: int = 1000) -> List[Dict]:
+        """
+        Get the most recent trades, optionally filtered by strategy.
+        
+        Rows are shaped for the API (max_profit/max_drawdown aliases), so
+        callers can return them without rebuilding each dict.
+        """
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute("""
-                    SELECT 
-                        COUNT(*) as total_trades,
-                        SUM(CASE WHEN result = 'WIN' THEN 1 ELSE 0 END) as wins,
-                        SUM(CASE WHEN result = 'LOSS' THEN 1 ELSE 0 END) as losses,
-                        SUM(pnl) as total_gross_pnl,
-                        SUM(net_pnl) as total_net_pnl,
-                        SUM(commission) as total_commission,
-                        AVG(net_pnl) as avg_net_pnl,
-                        MAX(net_pnl) as best_trade,
-                        MIN(net_pnl) as worst_trade,
-                        AVG(max_unrealized_loss) as avg_max_drawdown,
-                        MIN(max_unrealized_loss) as worst_drawdown
-                    FROM trades 
-                    WHERE strategy_id = ? AND status = 'CLOSED'
-                """, (strategy_id,))
+                if strategy_id is None:
+                    cursor.execute(_LIST_TRADES_ALL_SQL, (limit,))
+                else:
+                    cursor.execute(_LIST_TRADES_ONE_SQL, (strategy_id, limit))
+                
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Failed to get trades: {e}")
+            return []
+    
+    def get_strategy_stats(self, strategy_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get aggregated statistics for a strategy, or for all strategies if None.
+        
+        Served from the strategy_stats rollup rather than scanning trades, and
+        cached in memory until the next write that changes the rollup.
+        """
+        key = (self._db_key, strategy_id)
+        cached = _stats_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return dict(cached[1])
+        
+        stats = self._query_strategy_stats(strategy_id)
+        if "error" not in stats:
+            _stats_cache[key] = (time.monotonic() + STATS_CACHE_TTL, stats)
+        return dict(stats)
+    
+    def _query_strategy_stats(self, strategy_id: Optional[str]) -> Dict[str, Any]:
+        """Read aggregated statistics from the strategy_stats rollup."""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                if strategy_id is None:
+                    cursor.execute(_STATS_SUMMARY_ALL_SQL)
+                else:
+                    cursor.execute(_STATS_SUMMARY_ONE_SQL, (strategy_id,))
                 
                 row = cursor.fetchone()
-                if not row or row["total_trades"] == 0:
+                if not row or not row["total_trades"]:
                     return {"total_trades": 0, "win_rate": 0, "gross_pnl": 0.0, "net_pnl": 0.0, "total_commission": 0.0}
                 
+                avg_net_pnl = (row["total_net_pnl"] or 0) / row["net_pnl_count"] if row["net_pnl_count"] else 0
+                avg_max_drawdown = (row["max_dd_sum"] or 0) / row["max_dd_count"] if row["max_dd_count"] else 0
+                
                 return {
                     "total_trades": row["total_trades"],
                     "wins": row["wins"] or 0,
@@ -656,10 +1487,10 @@ class TradingDataService:
                     "net_pnl": round(row["total_net_pnl"] or 0, 2),
                     "total_pnl": round(row["total_net_pnl"] or 0, 2), # Keeping total_pnl as net_pnl for backward compat if needed, but added gross_pnl explicitly
                     "total_commission": round(row["total_commission"] or 0, 2),
-                    "avg_net_pnl": round(row["avg_net_pnl"] or 0, 2),
+                    "avg_net_pnl": round(avg_net_pnl, 2),
                     "max_win": round(row["best_trade"] or 0, 2),
                     "max_loss": round(row["worst_trade"] or 0, 2),
-                    "avg_max_drawdown": round(row["avg_max_drawdown"] or 0, 2),
+                    "avg_max_drawdown": round(avg_max_drawdown, 2),
                     "worst_drawdown": round(row["worst_drawdown"] or 0, 2),
                 }
                 
@@ -667,6 +1498,18 @@ class TradingDataService:
             logger.error(f"Failed to get strategy stats for {strategy_id}: {e}")
             return {"total_trades": 0, "error": str(e)}
     
+    def rebuild_strategy_stats(self) -> bool:
+        """Recompute the strategy_stats rollup for every strategy (after bulk imports)."""
+        try:
+            with self._get_connection(write=True) as conn:
+                self._refresh_strategy_stats(conn)
+                conn.commit()
+            self._invalidate_stats_cache()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to rebuild strategy stats: {e}")
+            return False
+    
     def get_drawdown_analysis(self, strategy_id: str) -> List[Dict]:
         """
         Get drawdown data for stop-loss tuning analysis.
@@ -699,7 +1542,7 @@ class TradingDataService:
                         entry_premium_per_contract
                     FROM trades 
                     WHERE strategy_id = ? AND status = 'CLOSED'
-                    ORDER BY entry_time DESC
+                    ORDER BY entry_ts DESC
                 """, (strategy_id,))
                 
                 return [dict(row) for row in cursor.fetchall()]
@@ -712,15 +1555,237 @@ class TradingDataService:
     # HELPERS
     # =========================================================================
     
+    def _trade_row(
+        self,
+        trade_id: str,
+        strategy_id: str,
+        instrument_id: str,
+        trade_type: str,
+        entry_price: float,
+        quantity: float,
+        direction: str,
+        entry_time: Optional[str] = None,
+        entry_reason: Optional[Dict] = None,
+        entry_target_price: Optional[float] = None,
+        entry_stop_loss: Optional[float] = None,
+        strikes: Optional[List[str]] = None,
+        expiration: Optional[str] = None,
+        legs: Optional[List[Dict]] = None,
+        strategy_config: Optional[Dict] = None,
+        max_profit: Optional[float] = None,
+        max_loss: Optional[float] = None,
+        entry_premium_per_contract: Optional[float] = None,
+    ) -> tuple:
+        """Build the _INSERT_TRADE_SQL parameters for a new trade."""
+        return (
+            trade_id,
+            strategy_id,
+            instrument_id,
+            trade_type,
+            self._r2(entry_price),
+            self._r2(quantity),
+            direction,
+            entry_time or datetime.utcnow().isoformat() + "Z",
+            self._safe_json(entry_reason),
+            self._r2(entry_target_price),
+            self._r2(entry_stop_loss),
+            self._safe_json(strikes),
+            expiration,
+            self._safe_json(legs),
+            self._safe_json(strategy_config),
+            self._r2(max_profit),
+            self._r2(max_loss),
+            self._r2(entry_premium_per_contract),
+        )
+    
+    def _close_row(
+        self,
+        trade_id: str,
+        trade_data: Dict[str, Any],
+        exit_price: float,
+        exit_reason: str,
+        exit_time: Optional[str] = None,
+        commission: Optional[float] = None,
+    ) -> tuple:
+        """
+        Build the _CLOSE_TRADE_SQL parameters for closing a tracked trade.
+        
+        Returns:
+            (parameters, unrounded pnl)
+        """
+        exit_time = exit_time or datetime.utcnow().isoformat() + "Z"
+        entry_price = trade_data["entry_price"]
+        quantity = trade_data["quantity"]
+        
+        # Calculate P&L
+        # For credit spreads: entry is negative (credit), exit is negative (debit to close)
+        # P&L = (exit_price - entry_price) * multiplier * quantity
+        # For credit spread LONG: entry=-0.95, exit=-0.45 → pnl = (-0.45 - (-0.95)) * 100 * 2 = +100
+        pnl = (exit_price - entry_price) * 100 * quantity
+        
+        # Commission
+        total_commission = commission or 0.0
+        net_pnl = pnl - total_commission
+        
+        return (
+            exit_time,
+            self._r2(exit_price),
+            exit_reason,
+            exit_time,  # duration_seconds, computed in SQL from entry_ts
+            self._r2(pnl),
+            self._r2(total_commission),
+            self._r2(net_pnl),
+            self._r2(trade_data.get("max_unrealized_profit", 0)),
+            self._r2(trade_data.get("max_unrealized_loss", 0)),
+            trade_data["max_dd_time"],
+            self._snapshots_json(trade_data),
+            trade_id,
+        ), pnl
+    
+    def _log_trade_closed(self, trade_id: str, exit_reason: str, pnl: float, net_pnl: float, trade_data: Dict):
+        """Log a completed close; result is derived like the generated column."""
+        logger.info(
+            f"Trade closed: {trade_id} | {exit_reason} | P&L: ${pnl:.2f} | "
+            f"Max DD: ${trade_data.get('max_unrealized_loss', 0):.2f} | Result: {_result_label(net_pnl)}"
+        )
+    
+    def _order_row(
+        self,
+        strategy_id: str,
+        instrument_id: str,
+        trade_type: str,
+        trade_direction: str,
+        order_side: str,
+        order_type: str,
+        quantity: float,
+        status: str,
+        submitted_time: str,
+        trade_id: Optional[str] = None,
+        exchange_order_id: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+        price_limit: Optional[float] = None,
+        filled_time: Optional[str] = None,
+        filled_quantity: Optional[float] = None,
+        filled_price: Optional[float] = None,
+        commission: float = 0.0,
+        raw_data: Optional[Union[Dict, str, bytes]] = None,
+    ) -> tuple:
+        """Build the _INSERT_ORDER_SQL parameters for a new order."""
+        return (
+            strategy_id,
+            instrument_id,
+            exchange_order_id,
+            client_order_id,
+            trade_id,
+            trade_type,
+            trade_direction,
+            order_side,
+            order_type,
+            self._r2(quantity),
+            self._r2(price_limit),
+            status,
+            submitted_time,
+            filled_time,
+            self._r2(filled_quantity),
+            self._r2(filled_price),
+            self._r2(commission),
+            self._json_blob(raw_data),
+        )
+    
+    def _insert_order_row(self, conn: sqlite3.Connection, row: tuple, order: Dict[str, Any]) -> Optional[int]:
+        """
+        Insert one _order_row() inside the caller's open transaction.
+        
+        Returns:
+            The new order ID, or None if it was a duplicate or failed
+        """
+        cursor = conn.cursor()
+        cursor.row_factory = None  # Plain tuples; results are read by position
+        try:
+            cursor.execute(_INSERT_ORDER_SQL, row)
+            inserted = cursor.fetchone()
+        except sqlite3.IntegrityError as e:
+            # Only the failed statement is rolled back
+            logger.error(f"Order integrity error: {e}")
+            return None
+        if inserted is None:
+            logger.debug(f"Order already exists: {order.get('exchange_order_id')}")
+            return None
+        return inserted[0]
+    
+    def _log_orders_recorded(self, order_ids: List[Optional[int]], orders: List[tuple]):
+        """Log the orders a bulk trade write inserted (duplicates return None)."""
+        for order_id, (_, order) in zip(order_ids, orders):
+            if order_id is not None:
+                logger.info(f"Order recorded: #{order_id} | {order['trade_direction']} | {order['order_side']} | {order['status']}")
+    
+    def _track_new_trade(self, row: tuple):
+        """
+        Start in-memory tracking for a newly opened trade.
+        
+        Takes the _trade_row() tuple that was inserted, so the entry fields
+        close_trade needs match the stored row exactly.
+        """
+        (trade_id, strategy_id, _, _, entry_price, quantity, _,
+         entry_time, _, _, entry_stop_loss) = row[:11]
+        self._active_trades[trade_id] = {
+            "strategy_id": strategy_id,
+            "entry_price": entry_price,
+            "quantity": quantity,
+            "entry_time": entry_time,
+            "entry_stop_loss": entry_stop_loss,
+            "max_unrealized_profit": 0.0,
+            "max_unrealized_loss": 0.0,
+            "max_dd_time": None,
+            # P&L curve as parallel columns, rather than a dict per tick:
+            # timestamps (ISO strings, or epoch seconds until serialized)
+            # and P&L values, each a ring buffer of the latest snapshots
+            "snapshot_ts": deque(maxlen=MAX_PNL_SNAPSHOTS),
+            "snapshot_pnl": deque(maxlen=MAX_PNL_SNAPSHOTS),
+        }
+    
+    def _snapshots_json(self, trade_data: Dict) -> str:
+        """Serialize a trade's P&L snapshots to the stored [{"ts", "pnl"}] JSON."""
+        return orjson.dumps([
+            {"ts": ts if isinstance(ts, str) else _utc_iso(ts), "pnl": pnl}
+            for ts, pnl in zip(trade_data.get("snapshot_ts", ()), trade_data.get("snapshot_pnl", ()))
+        ]).decode()
+    
     def _safe_json(self, data: Any) -> Optional[str]:
         """Safely serialize data to JSON, returning None on failure."""
         if data is None:
             return None
+        try:
+            return orjson.dumps(data).decode()
+        except TypeError:
+            pass
+        # Types orjson rejects (e.g. non-str keys, float subclasses)
         try:
             return json.dumps(data)
         except Exception:
             return None
 
+    def _json_blob(self, data: Any) -> Optional[bytes]:
+        """
+        Serialize data to UTF-8 JSON bytes for a BLOB column.
+        
+        orjson produces bytes directly, so there is no str round-trip or
+        re-encode when binding. Already-serialized bytes pass through, and
+        JSON text is only encoded.
+        """
+        if data is None or isinstance(data, (bytes, memoryview)):
+            return data
+        if isinstance(data, str):
+            return data.encode()
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            # Types orjson rejects (e.g. non-str keys, float subclasses)
+            try:
+                return json.dumps(data).encode()
+            except Exception:
+                return None
+    
     def _r2(self, val: Any) -> Any:
         """Safely round numbers to 2 decimal places."""
         if val is None:
@@ -729,25 +1794,60 @@ class TradingDataService:
             return round(float(val), 2)
         return val
     
+    def _refresh_strategy_stats(self, conn: sqlite3.Connection, strategy_id: Optional[str] = None):
+        """
+        Recompute strategy_stats from closed trades, for one strategy or all.
+        
+        Runs inside the caller's transaction so the rollup commits together
+        with the trade change that triggered it.
+        """
+        if strategy_id is None:
+            conn.execute("DELETE FROM strategy_stats")
+            conn.execute(_STATS_AGGREGATE_ALL_SQL)
+        else:
+            conn.execute("DELETE FROM strategy_stats WHERE strategy_id = ?", (strategy_id,))
+            conn.execute(_STATS_AGGREGATE_ONE_SQL, (strategy_id,))
+    
+    def _invalidate_stats_cache(self, strategy_id: Optional[str] = None):
+        """
+        Drop cached stats after a commit that changed the rollup.
+        
+        A strategy's change also invalidates the all-strategies totals;
+        None drops every entry for this database.
+        """
+        if strategy_id is None:
+            for key in [k for k in _stats_cache if k[0] == self._db_key]:
+                _stats_cache.pop(key, None)
+        else:
+            _stats_cache.pop((self._db_key, strategy_id), None)
+            _stats_cache.pop((self._db_key, None), None)
+    
     def _load_active_trade(self, trade_id: str) -> bool:
         """Load a trade into active tracking from database."""
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    "SELECT entry_stop_loss, max_unrealized_profit, max_unrealized_loss, "
-                    "max_unrealized_loss_time, pnl_snapshots FROM trades WHERE trade_id = ?",
+                    "SELECT strategy_id, entry_price, quantity, entry_time, entry_stop_loss, "
+                    "max_unrealized_profit, max_unrealized_loss, max_unrealized_loss_time, "
+                    "pnl_snapshots FROM trades WHERE trade_id = ?",
                     (trade_id,)
                 )
                 row = cursor.fetchone()
                 
                 if row:
+                    snapshots = orjson.loads(row["pnl_snapshots"]) if row["pnl_snapshots"] else []
                     self._active_trades[trade_id] = {
+                        "strategy_id": row["strategy_id"],
+                        "entry_price": row["entry_price"],
+                        "quantity": row["quantity"],
+                        "entry_time": row["entry_time"],
                         "entry_stop_loss": row["entry_stop_loss"],
                         "max_unrealized_profit": row["max_unrealized_profit"] or 0.0,
                         "max_unrealized_loss": row["max_unrealized_loss"] or 0.0,
                         "max_dd_time": row["max_unrealized_loss_time"],
-                        "pnl_snapshots": json.loads(row["pnl_snapshots"]) if row["pnl_snapshots"] else [],
+                        "snapshot_ts": deque((snap["ts"] for snap in snapshots), maxlen=MAX_PNL_SNAPSHOTS),
+                        "snapshot_pnl": deque((snap["pnl"] for snap in snapshots), maxlen=MAX_PNL_SNAPSHOTS),
                     }
                     return True
                     
@@ -757,28 +1857,58 @@ class TradingDataService:
             return False
     
     def _persist_trade_metrics(self, trade_id: str, trade_data: Dict) -> bool:
-        """Persist trade metrics to database."""
-        try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    UPDATE trades SET
-                        max_unrealized_profit = ?,
-                        max_unrealized_loss = ?,
-                        max_unrealized_loss_time = ?,
-                        updated_at = datetime('now')
-                    WHERE trade_id = ?
-                """, (
-                    self._r2(trade_data.get("max_unrealized_profit", 0)),
-                    self._r2(trade_data.get("max_unrealized_loss", 0)),
-                    trade_data.get("max_dd_time"),
+        """
+        Queue a trade's metrics for the next flush_trade_metrics().
+        
+        The values are read from _active_trades at flush time, so repeated
+        new extremes between flushes cost a single row write.
+        """
+        with self._dirty_lock:
+            self._dirty_trades.add(trade_id)
+        return True
+    
+    def flush_trade_metrics(self) -> int:
+        """
+        Write queued max profit / max drawdown updates in one transaction.
+        
+        Called by the maintenance thread every METRICS_FLUSH_INTERVAL and on
+        close(). close_trade() writes the final metrics itself.
+        
+        Returns:
+            Number of trades written
+        """
+        with self._dirty_lock:
+            if not self._dirty_trades:
+                return 0
+            dirty, self._dirty_trades = self._dirty_trades, set()
+        
+        now = _sql_now()
+        rows = []
+        for trade_id in dirty:
+            trade_data = self._active_trades.get(trade_id)
+            if trade_data:  # Closed, cancelled or deleted since it was queued
+                # Every tracked trade has these keys, already rounded on update
+                rows.append((
+                    trade_data["max_unrealized_profit"],
+                    trade_data["max_unrealized_loss"],
+                    trade_data["max_dd_time"],
+                    now,
                     trade_id,
                 ))
+        if not rows:
+            return 0
+        
+        try:
+            with self._get_connection(write=True) as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(_UPDATE_TRADE_METRICS_SQL, rows)
                 conn.commit()
-                return True
+            return len(rows)
         except Exception as e:
-            logger.error(f"Failed to persist trade metrics {trade_id}: {e}")
-            return False
+            logger.error(f"Failed to flush trade metrics for {len(rows)} trades: {e}")
+            with self._dirty_lock:
+                self._dirty_trades.update(dirty)
+            return 0
     
     def cancel_trade(self, trade_id: str) -> bool:
         """Cancel tracking for a trade (e.g., entry cancelled)."""
@@ -797,16 +1927,36 @@ class TradingDataService:
             True if deletion was successful (or trade didn't exist), False on error.
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_connection(write=True) as conn:
+                # The delete, its order cascade and any stats refresh share
+                # one transaction and one commit
+                conn.execute("BEGIN IMMEDIATE")
                 cursor = conn.cursor()
-                # Delete associated orders first (FK-safe order)
-                cursor.execute("DELETE FROM orders WHERE trade_id = ?", (trade_id,))
-                orders_deleted = cursor.rowcount
-                # Delete the trade record itself
-                cursor.execute("DELETE FROM trades WHERE trade_id = ?", (trade_id,))
-                trades_deleted = cursor.rowcount
+                cursor.row_factory = None  # Plain tuples; results are read by position
+                # Associated orders are removed by trg_trades_delete_orders;
+                # rowcount excludes trigger changes, total_changes does not
+                changes_before = conn.total_changes
+                cursor.execute(
+                    "DELETE FROM trades WHERE trade_id = ? RETURNING strategy_id, status",
+                    (trade_id,),
+                )
+                deleted = cursor.fetchall()
+                trades_deleted = len(deleted)
+                if deleted:
+                    orders_deleted = conn.total_changes - changes_before - trades_deleted
+                else:
+                    # No trade row to fire the trigger; still clear stray orders
+                    cursor.execute("DELETE FROM orders WHERE trade_id = ?", (trade_id,))
+                    orders_deleted = cursor.rowcount
+                for strategy_id, status in deleted:
+                    if status == "CLOSED":
+                        self._refresh_strategy_stats(conn, strategy_id)
                 conn.commit()
 
+            for strategy_id, status in deleted:
+                if status == "CLOSED":
+                    self._invalidate_stats_cache(strategy_id)
+
             # Remove from in-memory tracking
             self._active_trades.pop(trade_id, None)
 
@@ -837,61 +1987,38 @@ class TradingDataService:
             True if update was successful, False on error.
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_connection(write=True) as conn:
+                # Both updates commit together, with the same updated_at
+                now = _sql_now()
+                conn.execute("BEGIN IMMEDIATE")
                 cursor = conn.cursor()
+                cursor.row_factory = None  # Plain tuples; results are read by position
 
-                # Fetch current trade to recalculate derived fields
+                # Update the trade, recalculating max_profit / max_loss
+                # proportionally in the same statement (max_loss is stored as
+                # a positive dollar amount for the original quantity)
                 cursor.execute(
-                    "SELECT entry_price, max_profit, max_loss, entry_premium_per_contract "
-                    "FROM trades WHERE trade_id = ?",
-                    (trade_id,),
+                    _UPDATE_TRADE_QUANTITY_SQL,
+                    (actual_quantity, actual_quantity, actual_quantity, now, trade_id),
                 )
                 row = cursor.fetchone()
                 if not row:
                     logger.error(f"Trade {trade_id} not found for quantity update")
                     return False
-
-                entry_price = row["entry_price"]
-                entry_premium = row["entry_premium_per_contract"]
-
-                # Recalculate max_profit / max_loss proportionally
-                new_max_profit = (entry_premium * actual_quantity) if entry_premium else None
-                # max_loss stored as positive dollar amount per original quantity
-                old_max_loss = row["max_loss"]
-                old_max_profit = row["max_profit"]
-                if old_max_profit and old_max_profit != 0:
-                    ratio = actual_quantity / (old_max_profit / entry_premium) if entry_premium else 1
-                    new_max_loss = old_max_loss * ratio if old_max_loss else None
-                else:
-                    new_max_loss = old_max_loss
-
-                # Update trade record
-                cursor.execute(
-                    """
-                    UPDATE trades SET
-                        quantity = ?,
-                        max_profit = ?,
-                        max_loss = ?,
-                        updated_at = datetime('now')
-                    WHERE trade_id = ?
-                    """,
-                    (actual_quantity, new_max_profit, new_max_loss, trade_id),
-                )
+                new_max_profit, new_max_loss = row
 
                 # Update the ENTRY order row for this trade
                 cursor.execute(
-                    """
-                    UPDATE orders SET
-                        quantity = ?,
-                        filled_quantity = ?,
-                        updated_at = datetime('now')
-                    WHERE trade_id = ? AND trade_direction = 'ENTRY'
-                    """,
-                    (actual_quantity, actual_quantity, trade_id),
+                    _UPDATE_ENTRY_ORDER_QUANTITY_SQL,
+                    (actual_quantity, actual_quantity, now, trade_id),
                 )
 
                 conn.commit()
 
+            trade_data = self._active_trades.get(trade_id)
+            if trade_data:
+                trade_data["quantity"] = actual_quantity
+
             logger.info(
                 f"Trade quantity updated: {trade_id} | "
                 f"new qty: {actual_quantity} | "
@@ -947,12 +2074,12 @@ class TradingDataService:
             True if reconciliation was successful, False on error.
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_connection(write=True) as conn:
                 cursor = conn.cursor()
 
                 # Fetch current trade data
                 cursor.execute(
-                    "SELECT entry_price, exit_price, quantity, commission, status "
+                    "SELECT strategy_id, entry_price, exit_price, quantity, commission, status "
                     "FROM trades WHERE trade_id = ?",
                     (trade_id,),
                 )
@@ -966,19 +2093,20 @@ class TradingDataService:
                 eff_exit = actual_exit_price if actual_exit_price is not None else row["exit_price"]
                 eff_qty = actual_quantity if actual_quantity is not None else row["quantity"]
                 
-                # Fetch existing order commissions to ensure we don't lose data
-                cursor.execute(
-                    "SELECT trade_direction, commission FROM orders WHERE trade_id = ?",
-                    (trade_id,)
-                )
-                order_rows = cursor.fetchall()
+                # Fetch existing order commissions to ensure we don't lose data,
+                # unless the caller already supplied both sides
                 existing_entry_comm = 0.0
                 existing_exit_comm = 0.0
-                for orow in order_rows:
-                    if orow["trade_direction"] == "ENTRY":
-                        existing_entry_comm = orow["commission"] or 0.0
-                    else:
-                        existing_exit_comm = orow["commission"] or 0.0
+                if entry_commission is None or exit_commission is None:
+                    cursor.execute(
+                        "SELECT trade_direction, commission FROM orders WHERE trade_id = ?",
+                        (trade_id,)
+                    )
+                    for orow in cursor.fetchall():
+                        if orow["trade_direction"] == "ENTRY":
+                            existing_entry_comm = orow["commission"] or 0.0
+                        else:
+                            existing_exit_comm = orow["commission"] or 0.0
 
                 eff_entry_comm = entry_commission if entry_commission is not None else existing_entry_comm
                 eff_exit_comm = exit_commission if exit_commission is not None else existing_exit_comm
@@ -1009,10 +2137,9 @@ class TradingDataService:
                 if row["status"] == "CLOSED" and eff_exit is not None:
                     pnl = (eff_exit - eff_entry) * 100 * eff_qty
                     net_pnl = pnl - eff_total_comm
-                    result = "WIN" if net_pnl > 0 else "LOSS" if net_pnl < 0 else "BREAKEVEN"
 
-                    trade_updates.extend(["pnl = ?", "net_pnl = ?", "result = ?"])
-                    trade_params.extend([round(pnl, 2), round(net_pnl, 2), result])
+                    trade_updates.extend(["pnl = ?", "net_pnl = ?"])
+                    trade_params.extend([round(pnl, 2), round(net_pnl, 2)])
 
                 if trade_updates:
                     trade_updates.append("updated_at = datetime('now')")
@@ -1021,6 +2148,8 @@ class TradingDataService:
                         f"UPDATE trades SET {', '.join(trade_updates)} WHERE trade_id = ?",
                         trade_params,
                     )
+                    if row["status"] == "CLOSED":
+                        self._refresh_strategy_stats(conn, row["strategy_id"])
 
                 # --- Update ENTRY order ---
                 entry_updates = []
@@ -1079,6 +2208,14 @@ class TradingDataService:
 
                 conn.commit()
 
+            if row["status"] == "CLOSED":
+                self._invalidate_stats_cache(row["strategy_id"])
+
+            trade_data = self._active_trades.get(trade_id)
+            if trade_data:
+                trade_data["entry_price"] = eff_entry
+                trade_data["quantity"] = eff_qty
+
             logger.info(
                 f"Trade reconciled: {trade_id} | "
                 f"entry={actual_entry_price} exit={actual_exit_price} "
@@ -1115,17 +2252,29 @@ class TradingDataService:
             old_conn.row_factory = sqlite3.Row
             cursor = old_conn.cursor()
             
-            cursor.execute("SELECT * FROM trade_drawdowns ORDER BY trade_date, entry_time")
-            rows = cursor.fetchall()
+            # Already-migrated ids in one query rather than a lookup per row
+            # (GLOB is case-sensitive, so it can use the trade_id index)
+            with self._get_connection() as conn:
+                migrated_ids = {
+                    r[0] for r in conn.execute("SELECT trade_id FROM trades WHERE trade_id GLOB 'MIGRATED-*'")
+                }
             
+            # Rows are streamed from the old database and written through the
+            # bulk paths every MIGRATION_BATCH_SIZE trades, so memory stays
+            # bounded and each batch costs a few transactions, not three per trade
             migrated = 0
-            for row in rows:
+            trades = []
+            drawdowns = []
+            closes = []
+            cursor.execute("SELECT * FROM trade_drawdowns ORDER BY trade_date, entry_time")
+            for row in cursor:
+                row = dict(row)
                 trade_id = f"MIGRATED-{row['trade_date']}-{row['entry_time'].replace(':', '')}"
                 
                 # Check if already migrated
-                existing = self.get_trade(trade_id)
-                if existing:
+                if trade_id in migrated_ids:
                     continue
+                migrated_ids.add(trade_id)
                 
                 entry_time = f"{row['trade_date']}T{row['entry_time']}Z"
                 exit_time = f"{row['trade_date']}T{row['exit_time']}Z" if row['exit_time'] else None
@@ -1136,7 +2285,7 @@ class TradingDataService:
                 if row.get('long_strike'):
                     strikes.append(f"{row['long_strike']}L")
                 
-                self.start_trade(
+                trades.append(dict(
                     trade_id=trade_id,
                     strategy_id=row.get('strategy_id', 'SPX_15Min_Range'),
                     instrument_id="MIGRATED",
@@ -1147,25 +2296,41 @@ class TradingDataService:
                     entry_time=entry_time,
                     strikes=strikes if strikes else None,
                     entry_premium_per_contract=row.get('entry_premium'),
-                )
+                ))
                 
                 if row.get('max_drawdown'):
-                    self.update_trade_metrics(trade_id, row['max_drawdown'])
+                    drawdowns.append((trade_id, row['max_drawdown']))
                 
                 if exit_time and row.get('final_result') is not None:
                     pnl = row['final_result']
                     exit_price = (row.get('entry_premium', 0) - pnl) / 100
-                    self.close_trade(
+                    closes.append(dict(
                         trade_id=trade_id,
                         exit_price=exit_price,
                         exit_reason="MIGRATED",
                         exit_time=exit_time,
-                    )
+                    ))
                 
-                migrated += 1
+                if len(trades) >= MIGRATION_BATCH_SIZE:
+                    migrated += self._write_migrated_batch(trades, drawdowns, closes)
             
+            migrated += self._write_migrated_batch(trades, drawdowns, closes)
             old_conn.close()
             logger.info(f"Migrated {migrated} trades from DrawdownRecorder")
             
         except Exception as e:
             logger.error(f"Migration failed: {e}")
+    
+    def _write_migrated_batch(self, trades: List[Dict], drawdowns: List[tuple], closes: List[Dict]) -> int:
+        """Write one batch of migrated trades and empty the lists. Returns trades written."""
+        written = len(self.start_trades_bulk(trades))
+        if written:
+            # In-memory only; written by the close below or the flush
+            for trade_id, max_drawdown in drawdowns:
+                self.update_trade_metrics(trade_id, max_drawdown)
+            self.close_trades_bulk(closes)
+            self.flush_trade_metrics()
+        trades.clear()
+        drawdowns.clear()
+        closes.clear()
+        return written
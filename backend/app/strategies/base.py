@@ -12,7 +12,7 @@ Phase 1: Enhanced Base Strategy - Maximum Nautilus Integration
 from abc import abstractmethod
 from typing import Dict, Any, Optional, Set, List, Tuple
 from datetime import datetime, timedelta
-import traceback
+import asyncio
 import logging
 from decimal import Decimal, ROUND_HALF_UP
 
@@ -24,9 +24,17 @@ from nautilus_trader.model.objects import Quantity
 from nautilus_trader.model.orders import Order, OrderList
 from nautilus_trader.model.position import Position
 from nautilus_trader.common.enums import ComponentState
+from nautilus_trader.core.datetime import unix_nanos_to_dt
 
 from .config import StrategyConfig
 
+# Purpose bit flags for BaseStrategy._pending_orders
+PENDING_ENTRY = 1
+PENDING_EXIT = 2
+
+# Minimum spacing of state file writes; saves inside the window are coalesced
+STATE_FLUSH_INTERVAL_NS = 250_000_000
+
 
 class BaseStrategy(Strategy):
     """
@@ -45,6 +53,9 @@ class BaseStrategy(Strategy):
     - Error isolation
     """
 
+    # Whether fill events expose `commission`; probed once on the first close
+    _EVENT_HAS_COMMISSION: Optional[bool] = None
+
     def __init__(
         self, 
         config: StrategyConfig, 
@@ -57,6 +68,15 @@ class BaseStrategy(Strategy):
         self.strategy_config = config
         self.strategy_id = config.id
         self.instrument_id = InstrumentId.from_str(config.instrument_id)
+        # Symbol shared by this instrument's venue-specific IDs (e.g. MESH6),
+        # compared as an identifier when matching open positions
+        self._instrument_symbol = self.instrument_id.symbol
+        self._cross_venue_netting = config.cross_venue_netting
+        
+        # Clock alert names, formatted once
+        self._instrument_timer_name = f"{self.id}.instrument_timeout"
+        self._spread_timer_name = f"{self.id}.spread_timeout"
+        self._state_flush_timer_name = f"{self.id}.state_flush"
         
         # Standard logging
         self.logger = logging.getLogger(f"strategy.{self.strategy_id}")
@@ -73,19 +93,21 @@ class BaseStrategy(Strategy):
         # Instrument state
         self.instrument: Optional[Instrument] = None
         self._instrument_ready = False
+        self._multiplier: float = 1.0  # instrument.multiplier, set once ready
         
         # Functional readiness (separate from Nautilus ComponentState)
         self._functional_ready = False
         
         # Order tracking for duplicate prevention and categorization
-        # We keep these sets to track order PURPOSE (entry/exit/sl/tp)
-        # The actual order state comes from cache via order.status
-        self._pending_entry_orders: Set[ClientOrderId] = set()
-        self._pending_exit_orders: Set[ClientOrderId] = set()
+        # One map tracks order PURPOSE (PENDING_ENTRY / PENDING_EXIT), so fill
+        # routing is a single lookup. The actual order state comes from cache
+        # via order.status. str(id) is cached at insert for save_state.
+        self._pending_orders: Dict[ClientOrderId, Tuple[int, str]] = {}
         
         # Position tracking
         self._last_entry_price: Optional[float] = None
         self._last_entry_qty: Optional[float] = None
+        self._last_exit_reason: str = 'UNKNOWN'
         self.signed_inventory: float = 0.0  # + for Long, - for Short, 0 for Flat
         
         # Spread support
@@ -126,7 +148,37 @@ class BaseStrategy(Strategy):
         # Used by subclasses to capture order IDs after close_spread_smart() calls
         # without needing to change the bool return type of open_spread_position().
         self._last_spread_order_id: Optional[ClientOrderId] = None
+        # Event loop for trade-record tasks, resolved on first use
+        self._async_loop = None
+        # (timestamp_ns, isoformat) of the last _now_iso() call
+        self._now_iso_cache: Tuple[int, str] = (0, "")
+        
+        # State persistence coalescing (see save_state)
+        self._state_dirty = False
+        self._state_last_flush_ns = 0
+        self._state_flush_scheduled = False
+        self._state_buf: Dict[str, Any] = {}  # Reused by every flush
+
+    def _mark_order(self, order_id: ClientOrderId, purpose: int):
+        """Track a submitted order's purpose, OR'd into any flags it already has."""
+        pending = self._pending_orders.get(order_id)
+        if pending:
+            self._pending_orders[order_id] = (pending[0] | purpose, pending[1])
+        else:
+            self._pending_orders[order_id] = (purpose, str(order_id))
+
+    def _order_purpose(self, order_id: ClientOrderId) -> int:
+        """Purpose flags of a pending order, 0 if it is not tracked."""
+        pending = self._pending_orders.get(order_id)
+        return pending[0] if pending else 0
 
+    def _is_entry(self, order_id: ClientOrderId) -> bool:
+        """Whether the order is a pending entry order."""
+        return bool(self._order_purpose(order_id) & PENDING_ENTRY)
+
+    def _is_exit(self, order_id: ClientOrderId) -> bool:
+        """Whether the order is a pending exit order."""
+        return bool(self._order_purpose(order_id) & PENDING_EXIT)
 
     # =========================================================================
     # LIFECYCLE MANAGEMENT (Using Nautilus ComponentState)
@@ -182,7 +234,7 @@ class BaseStrategy(Strategy):
             
             # Set timeout for instrument availability
             self.clock.set_time_alert(
-                name=f"{self.id}.instrument_timeout",
+                name=self._instrument_timer_name,
                 alert_time=self.clock.utc_now() + timedelta(seconds=60),
                 callback=self._on_instrument_timeout
             )
@@ -213,6 +265,8 @@ class BaseStrategy(Strategy):
             return
 
         self._instrument_ready = True
+        if self.instrument is not None:
+            self._multiplier = float(self.instrument.multiplier)
         self.logger.info(
             f"Instrument {self.instrument_id} ready",
             extra={
@@ -228,7 +282,7 @@ class BaseStrategy(Strategy):
             try:
                 # Cancel timeout (ignore cancel errors)
                 try:
-                    self.clock.cancel_timer(f"{self.id}.instrument_timeout")
+                    self.clock.cancel_timer(self._instrument_timer_name)
                 except Exception:
                     pass
 
@@ -283,7 +337,9 @@ class BaseStrategy(Strategy):
         try:
             self.on_stop_safe()
             if self._functional_ready:
-                self.save_state()
+                # Write now: pending time alerts do not fire once stopped
+                self.save_state(force=True)
+                self._state_flush_scheduled = False
         except Exception as e:
             self.on_unexpected_error(e)
 
@@ -306,10 +362,7 @@ class BaseStrategy(Strategy):
         Nautilus state: STOPPED -> RESUMING -> RUNNING
         """
         self.logger.info(f"Strategy {self.strategy_id} resuming...")
-        try:
-            self.on_resume_safe()
-        except Exception as e:
-            self.on_unexpected_error(e)
+        self._safe_call(self.on_resume_safe)
 
     # =========================================================================
     # SPREAD MANAGEMENT (Option Spreads / Combos)
@@ -476,7 +529,7 @@ class BaseStrategy(Strategy):
             
             # Set timeout for spread availability
             self.clock.set_time_alert(
-                name=f"{self.id}.spread_timeout",
+                name=self._spread_timer_name,
                 alert_time=self.clock.utc_now() + timedelta(seconds=timeout_seconds),
                 callback=self._on_spread_timeout
             )
@@ -942,33 +995,40 @@ class BaseStrategy(Strategy):
         Calculates Net Quantity across all venues for the symbol to handle 
         offsetting ghost positions (e.g. LONG on CME-EXTERNAL and SHORT on CME).
         """
-        # Symbol to match (e.g., MESH6)
-        target_symbol = str(self.instrument_id.symbol)
-        all_open_positions = self.cache.positions_open()
+        # Symbol to match (e.g., MESH6). With cross-venue netting every venue
+        # is scanned, not just positions_open(instrument_id=...), so that
+        # offsetting positions on other venues still net out
+        target_symbol = self._instrument_symbol
+        if self._cross_venue_netting:
+            all_open_positions = self.cache.positions_open()
+        else:
+            # Indexed by the cache; every position matches the symbol below
+            all_open_positions = self.cache.positions_open(instrument_id=self.instrument_id)
         
         symbol_positions = []
-        net_qty = 0.0
+        # Summed in raw fixed-point units: exact integers on one shared scale
+        # for every instrument, so offsetting positions net to exactly zero
+        net_qty_raw = 0
         
         for pos in all_open_positions:
-            # Check if symbol matches (fuzzy match for venue-specific IDs)
-            if str(pos.instrument_id.symbol) == target_symbol:
+            # Check if symbol matches (fuzzy match for venue-specific IDs);
+            # identifiers compare by value, without formatting a string each
+            if pos.instrument_id.symbol == target_symbol:
                 symbol_positions.append(pos)
-                qty = float(pos.quantity)
                 if pos.side == PositionSide.LONG:
-                    net_qty += qty
+                    net_qty_raw += pos.quantity.raw
                 else:
-                    net_qty -= qty
+                    net_qty_raw -= pos.quantity.raw
         
         if not symbol_positions:
             return None
             
-        # If net quantity is effectively zero, we are flat
-        if abs(net_qty) < 1e-6: # Conservative floating point safety
-            if len(symbol_positions) > 0:
-                self.logger.debug(
-                    f"Net position for {target_symbol} is negligible ({net_qty:.8f}) "
-                    f"across {len(symbol_positions)} positions. Treating as FLAT."
-                )
+        # Offsetting positions: we are flat
+        if net_qty_raw == 0:
+            self.logger.debug(
+                f"Net position for {target_symbol} is zero "
+                f"across {len(symbol_positions)} positions. Treating as FLAT."
+            )
             return None
             
         # We have a non-zero net position. 
@@ -978,8 +1038,12 @@ class BaseStrategy(Strategy):
             return exact_match
             
         # Otherwise return the largest matching position as a proxy
-        sorted_pos = sorted(symbol_positions, key=lambda x: float(x.quantity), reverse=True)
+        sorted_pos = sorted(symbol_positions, key=lambda x: x.quantity.raw, reverse=True)
         pos = sorted_pos[0]
+        net_qty = sum(
+            float(p.quantity) if p.side == PositionSide.LONG else -float(p.quantity)
+            for p in symbol_positions
+        )
         self.logger.info(
             f"Fuzzy matched position {pos.instrument_id} for strategy instrument {self.instrument_id} "
             f"(Net Symbol Qty: {net_qty:.4f})"
@@ -990,15 +1054,20 @@ class BaseStrategy(Strategy):
     # ORDER MANAGEMENT & DUPLICATE PREVENTION (Using Nautilus Cache)
     # =========================================================================
 
-    def _get_pending_orders(self) -> list:
-        """Get all pending orders for this instrument from cache."""
+    def _get_pending_orders(self) -> tuple:
+        """
+        Get all pending orders for this instrument from cache.
+        
+        Read fresh on every call rather than memoized per tick: an order
+        submitted earlier in the same handler must already block duplicates.
+        """
         # In-flight orders (submitted but not yet accepted/rejected)
         inflight = self.cache.orders_inflight(instrument_id=self.instrument_id)
         
         # Open orders (accepted but not filled/canceled)
         open_orders = self.cache.orders_open(instrument_id=self.instrument_id)
         
-        return list(inflight) + list(open_orders)
+        return (*inflight, *open_orders)
 
     def can_submit_entry_order(self) -> tuple[bool, str]:
         """
@@ -1018,9 +1087,7 @@ class BaseStrategy(Strategy):
             return False, "Strategy not functionally ready (waiting for instrument/data)"
         
         # Check for ANY pending orders for this instrument (DUPLICATE PREVENTION)
-        open_orders = list(self.cache.orders_open(instrument_id=self.instrument_id))
-        inflight_orders = list(self.cache.orders_inflight(instrument_id=self.instrument_id))
-        all_pending = open_orders + inflight_orders
+        all_pending = self._get_pending_orders()
         
         if all_pending:
             pending_ids = [order.client_order_id for order in all_pending]
@@ -1038,33 +1105,38 @@ class BaseStrategy(Strategy):
         Check if an exit order can be submitted.
         Returns: (can_submit, reason)
         """
+        can_submit, reason, _, _ = self._check_exit_order()
+        return can_submit, reason
+
+    def _check_exit_order(self) -> Tuple[bool, str, Optional[Position], Optional[OrderSide]]:
+        """
+        can_submit_exit_order(), also returning the open position and its
+        closing side so callers don't scan positions a second time.
+        Returns: (can_submit, reason, position, closing_side)
+        """
         # Check Nautilus state
         if self.state == ComponentState.STOPPED:
-            return False, "Strategy stopped"
+            return False, "Strategy stopped", None, None
         
         # Check for open position
         pos = self._get_open_position()
         if not pos:
-            return False, "No position to close"
+            return False, "No position to close", None, None
         
         # Determine the side that would close this position
         closing_side = OrderSide.SELL if pos.side == PositionSide.LONG else OrderSide.BUY
 
         # Check for ANY open orders on the closing side for this instrument
         # This covers orders from this strategy, previous instances, and manual orders
-        open_orders = list(self.cache.orders_open(instrument_id=self.instrument_id))
-        inflight_orders = list(self.cache.orders_inflight(instrument_id=self.instrument_id))
-        all_pending = open_orders + inflight_orders
-        
         active_closing_orders = [
-            order.client_order_id for order in all_pending 
+            order.client_order_id for order in self._get_pending_orders()
             if order.side == closing_side
         ]
         
         if active_closing_orders:
-            return False, f"Exit order ({closing_side.name}) already pending: {active_closing_orders}"
+            return False, f"Exit order ({closing_side.name}) already pending: {active_closing_orders}", pos, closing_side
         
-        return True, ""
+        return True, "", pos, closing_side
 
     def submit_bracket_order(
         self, 
@@ -1136,7 +1208,7 @@ class BaseStrategy(Strategy):
                 )
                 orders.append(sl_order)
                 self._bracket_exit_map[sl_order.client_order_id] = "STOP_LOSS"
-                self._pending_exit_orders.add(sl_order.client_order_id)
+                self._mark_order(sl_order.client_order_id, PENDING_EXIT)
             else:
                 self.logger.error("Instrument not found in cache for SL calculation")
 
@@ -1157,20 +1229,18 @@ class BaseStrategy(Strategy):
                 )
                 orders.append(tp_order)
                 self._bracket_exit_map[tp_order.client_order_id] = "TAKE_PROFIT"
-                self._pending_exit_orders.add(tp_order.client_order_id)
+                self._mark_order(tp_order.client_order_id, PENDING_EXIT)
             else:
                 self.logger.error("Instrument not found in cache for TP calculation")
 
         # 3. Submit Atomic Order List
-        from nautilus_trader.model.orders import OrderList
-        
         order_list = OrderList(
             order_list_id=self.order_factory.generate_order_list_id(),
             orders=orders
         )
         
         # Track entry order
-        self._pending_entry_orders.add(entry_order.client_order_id)
+        self._mark_order(entry_order.client_order_id, PENDING_ENTRY)
         
         self.submit_order_list(order_list)
         
@@ -1195,7 +1265,6 @@ class BaseStrategy(Strategy):
         sl_price_val = exit_data.get("stop_loss_price")
         tp_price_val = exit_data.get("take_profit_price")
         inst_id_str = exit_data["instrument_id"]
-        from nautilus_trader.model.identifiers import InstrumentId
         inst_id = InstrumentId.from_str(inst_id_str)
         qty = self.instrument.make_qty(exit_data["quantity"])
         tif = exit_data["time_in_force"]
@@ -1231,7 +1300,7 @@ class BaseStrategy(Strategy):
             )
             orders.append(sl_order)
             self._bracket_exit_map[sl_order.client_order_id] = "STOP_LOSS"
-            self._pending_exit_orders.add(sl_order.client_order_id)
+            self._mark_order(sl_order.client_order_id, PENDING_EXIT)
 
         # 2. Take Profit (LIMIT)
         if tp_price_val is not None:
@@ -1248,10 +1317,9 @@ class BaseStrategy(Strategy):
             )
             orders.append(tp_order)
             self._bracket_exit_map[tp_order.client_order_id] = "TAKE_PROFIT"
-            self._pending_exit_orders.add(tp_order.client_order_id)
+            self._mark_order(tp_order.client_order_id, PENDING_EXIT)
 
         if orders:
-            from nautilus_trader.model.orders import OrderList
             order_list = OrderList(
                 order_list_id=self.order_factory.generate_order_list_id(),
                 orders=orders
@@ -1281,7 +1349,7 @@ class BaseStrategy(Strategy):
             return False
         
         # Track as pending
-        self._pending_entry_orders.add(order.client_order_id)
+        self._mark_order(order.client_order_id, PENDING_ENTRY)
         
         # Submit to broker
         self.submit_order(order)
@@ -1312,7 +1380,7 @@ class BaseStrategy(Strategy):
             return False
         
         # Track as pending
-        self._pending_exit_orders.add(order.client_order_id)
+        self._mark_order(order.client_order_id, PENDING_EXIT)
         
         # Submit to broker
         self.submit_order(order)
@@ -1337,18 +1405,17 @@ class BaseStrategy(Strategy):
         Stores exit reason for trade recording.
         """
         # Check if we can submit an exit order (includes position check and duplicate prevention)
-        can_submit, reason_msg = self.can_submit_exit_order()
+        can_submit, reason_msg, pos, side = self._check_exit_order()
         if not can_submit:
             # If position exists but order is pending, we don't need to log a warning every time, 
             # but for manual trigger it's useful.
             self.logger.info(f"Skipping position close: {reason_msg}")
             return
         
-        pos = self._get_open_position() # Guaranteed to exist due to can_submit_exit_order
+        # pos and its closing side come from the check above
         self._last_exit_reason = reason
         
-        # Determine the side and account to close this position
-        side = OrderSide.SELL if pos.side == PositionSide.LONG else OrderSide.BUY
+        # Determine the account to close this position
         p_account = pos.account_id
         
         # QUANTITY SAFETY: Use our tracked inventory if available, otherwise fallback to pos.quantity
@@ -1387,7 +1454,7 @@ class BaseStrategy(Strategy):
             self.logger.warning(f"Position account {p_account} differs from strategy account {self.account_id}. Overriding.")
 
         # Track as pending
-        self._pending_exit_orders.add(order.client_order_id)
+        self._mark_order(order.client_order_id, PENDING_EXIT)
         
         self.submit_order(order)
         self.logger.info(
@@ -1414,26 +1481,28 @@ class BaseStrategy(Strategy):
         """Order submitted event."""
         try:
             order_id = event.client_order_id
-            order = self.cache.order(order_id)
             is_spread_order = order_id in self._pending_spread_orders
             
-            if order:
-                if is_spread_order:
-                    self.logger.info(
-                        f"📨 SPREAD ORDER ACCEPTED BY BROKER| ID: {order_id} | Status: {order.status.name} | Waiting for fill...",
-                        extra={
-                            "extra": {
-                                "event_type": "spread_order_accepted",
-                                "order_id": str(order_id),
-                                "instrument_id": str(order.instrument_id),
-                                "status": order.status.name
+            # The order is looked up for these log lines only
+            if self.logger.isEnabledFor(logging.INFO if is_spread_order else logging.DEBUG):
+                order = self.cache.order(order_id)
+                if order:
+                    if is_spread_order:
+                        self.logger.info(
+                            f"📨 SPREAD ORDER ACCEPTED BY BROKER| ID: {order_id} | Status: {order.status.name} | Waiting for fill...",
+                            extra={
+                                "extra": {
+                                    "event_type": "spread_order_accepted",
+                                    "order_id": str(order_id),
+                                    "instrument_id": str(order.instrument_id),
+                                    "status": order.status.name
+                                }
                             }
-                        }
-                    )
-                else:
-                    self.logger.debug(
-                        f"Order submitted: {order_id} (status: {order.status.name})"
-                    )
+                        )
+                    else:
+                        self.logger.debug(
+                            f"Order submitted: {order_id} (status: {order.status.name})"
+                        )
             self.on_order_submitted_safe(event)
         except Exception as e:
             self.on_unexpected_error(e)
@@ -1445,8 +1514,7 @@ class BaseStrategy(Strategy):
             is_spread_order = order_id in self._pending_spread_orders
             
             # Remove from pending sets
-            self._pending_entry_orders.discard(order_id)
-            self._pending_exit_orders.discard(order_id)
+            self._pending_orders.pop(order_id, None)
             self._pending_spread_orders.discard(order_id)
             
             # Get order from cache to check status
@@ -1484,8 +1552,7 @@ class BaseStrategy(Strategy):
             is_spread_order = order_id in self._pending_spread_orders
             
             # Remove from pending sets
-            self._pending_entry_orders.discard(order_id)
-            self._pending_exit_orders.discard(order_id)
+            self._pending_orders.pop(order_id, None)
             self._pending_spread_orders.discard(order_id)
             
             if is_spread_order:
@@ -1512,8 +1579,7 @@ class BaseStrategy(Strategy):
             is_spread_order = order_id in self._pending_spread_orders
             
             # Remove from pending sets
-            self._pending_entry_orders.discard(order_id)
-            self._pending_exit_orders.discard(order_id)
+            self._pending_orders.pop(order_id, None)
             self._pending_spread_orders.discard(order_id)
             
             if is_spread_order:
@@ -1589,24 +1655,27 @@ class BaseStrategy(Strategy):
             # IB decomposes spread orders into individual LEG orders (e.g. O-xxx-LEG-SPXW...),
             # which are not tracked in _pending_spread_orders and may not be in Nautilus cache.
             # Without this log, those fills are invisible (only commission capture fires).
-            self.logger.info(
-                f"📥 FILL EVENT | Order: {order_id} | Instrument: {event.instrument_id} | "
-                f"Side: {event.order_side.name} | Qty: {event.last_qty} | Px: {event.last_px}",
-                extra={
-                    "extra": {
-                        "event_type": "fill_event_raw",
-                        "order_id": str(order_id),
-                        "instrument_id": str(event.instrument_id),
-                        "fill_qty": float(event.last_qty),
-                        "fill_price": float(event.last_px),
-                        "side": event.order_side.name,
-                    }
-                }
-            )
-            self._notify(
+            # Hot path: the message is formatted once for both log and notification,
+            # and the structured extras only when INFO is enabled
+            fill_msg = (
                 f"📥 FILL EVENT | Order: {order_id} | Instrument: {event.instrument_id} | "
                 f"Side: {event.order_side.name} | Qty: {event.last_qty} | Px: {event.last_px}"
             )
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    fill_msg,
+                    extra={
+                        "extra": {
+                            "event_type": "fill_event_raw",
+                            "order_id": str(order_id),
+                            "instrument_id": str(event.instrument_id),
+                            "fill_qty": float(event.last_qty),
+                            "fill_price": float(event.last_px),
+                            "side": event.order_side.name,
+                        }
+                    }
+                )
+            self._notify(fill_msg)
 
             # === ACCUMULATE LEG FILLS ===
             # IB decomposes spread orders into individual LEG sub-orders
@@ -1642,16 +1711,18 @@ class BaseStrategy(Strategy):
 
                 acc["last_fill_time"] = str(getattr(event, "ts_event", None))
 
-                self.logger.debug(
-                    f"📊 LEG FILL ACCUMULATED | Parent: {parent_id} | "
-                    f"Side: {event.order_side.name} | Qty: {qty} | Px: {px}"
-                )
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(
+                        f"📊 LEG FILL ACCUMULATED | Parent: {parent_id} | "
+                        f"Side: {event.order_side.name} | Qty: {qty} | Px: {px}"
+                    )
 
             
             # Determine if entry or exit based on our tracking
             # CRITICAL FIX: Do NOT discard here yet! Only discard if status is FILLED.
-            is_entry = order_id in self._pending_entry_orders
-            is_exit = order_id in self._pending_exit_orders
+            purpose = self._order_purpose(order_id)
+            is_entry = bool(purpose & PENDING_ENTRY)
+            is_exit = bool(purpose & PENDING_EXIT)
             is_spread_order = order_id in self._pending_spread_orders
             
             # Get order from cache to verify status
@@ -1665,8 +1736,11 @@ class BaseStrategy(Strategy):
                      display_price = tracked_limit
                 
                 fill_value = float(event.last_qty) * display_price * 100  # Options multiplier
+                spread_fill_msg = (
+                    f"✅ SPREAD ORDER FILLED BY BROKER | {order.instrument_id} | {order.side.name} | Qty: {event.last_qty} | Px: {display_price} | Val: ${abs(fill_value):.2f}"
+                )
                 self.logger.info(
-                    f"✅ SPREAD ORDER FILLED BY BROKER | {order.instrument_id} | {order.side.name} | Qty: {event.last_qty} | Px: {display_price} | Val: ${abs(fill_value):.2f}",
+                    spread_fill_msg,
                     extra={
                         "extra": {
                             "event_type": "spread_fill",
@@ -1681,10 +1755,8 @@ class BaseStrategy(Strategy):
                         }
                     }
                 )
-                self._notify(
-                    f"✅ SPREAD ORDER FILLED BY BROKER | {order.instrument_id} | {order.side.name} | Qty: {event.last_qty} | Px: {display_price} | Val: ${abs(fill_value):.2f}"
-                )
-            elif order:
+                self._notify(spread_fill_msg)
+            elif order and self.logger.isEnabledFor(logging.INFO):
                 self.logger.info(
                     f"Order filled: {order_id} | {order.status.name} | Qty: {event.last_qty} | Px: {event.last_px}",
                     extra={
@@ -1734,20 +1806,22 @@ class BaseStrategy(Strategy):
             # === CUMULATIVE POSITION LOG ===
             # After each fill, show the effective spread position so user can track fill progress.
             # This is especially important for LEG fills that don't trigger PARTIAL_FILL logs.
-            try:
-                effective_qty = self.get_effective_spread_quantity()
-                self.logger.info(
-                    f"📊 FILL PROGRESS | After fill: effective spread qty = {effective_qty}",
-                    extra={
-                        "extra": {
-                            "event_type": "fill_progress",
-                            "effective_spread_qty": effective_qty,
-                            "trigger_order_id": str(order_id),
+            # The quantity is computed for this log only, so skip it when INFO is off.
+            if self.logger.isEnabledFor(logging.INFO):
+                try:
+                    effective_qty = self.get_effective_spread_quantity()
+                    self.logger.info(
+                        f"📊 FILL PROGRESS | After fill: effective spread qty = {effective_qty}",
+                        extra={
+                            "extra": {
+                                "event_type": "fill_progress",
+                                "effective_spread_qty": effective_qty,
+                                "trigger_order_id": str(order_id),
+                            }
                         }
-                    }
-                )
-            except Exception:
-                pass  # get_effective_spread_quantity may not be available in all strategies
+                    )
+                except Exception:
+                    pass  # get_effective_spread_quantity may not be available in all strategies
 
             # CRITICAL: Clean up tracking sets ONLY if order is fully filled
             # If PARTIALLY_FILLED, we need to keep tracking it for subsequent fills
@@ -1774,8 +1848,7 @@ class BaseStrategy(Strategy):
                 )
             
             if order and order.status == OrderStatus.FILLED:
-                self._pending_entry_orders.discard(order_id)
-                self._pending_exit_orders.discard(order_id)
+                self._pending_orders.pop(order_id, None)
                 self._pending_spread_orders.discard(order_id)
                 
                 self.logger.info(
@@ -1798,8 +1871,7 @@ class BaseStrategy(Strategy):
                 parent_id = ClientOrderId(str(order_id).split("-LEG-")[0])
                 parent = self.cache.order(parent_id)
                 if parent and parent.status == OrderStatus.FILLED and parent_id in self._pending_spread_orders:
-                    self._pending_entry_orders.discard(parent_id)
-                    self._pending_exit_orders.discard(parent_id)
+                    self._pending_orders.pop(parent_id, None)
                     self._pending_spread_orders.discard(parent_id)
                     self.logger.info(
                         f"🏁 Order fully filled | Tracking cleaned up | ID: {parent_id}",
@@ -1950,17 +2022,18 @@ class BaseStrategy(Strategy):
 
     def _on_entry_filled(self, event):
         """Handle entry fill - start trade record."""
-        self.logger.info(
-            f"Entry filled | Qty: {event.last_qty} | Px: {event.last_px}",
-            extra={
-                "extra": {
-                    "event_type": "entry_filled_processed",
-                    "quantity": float(event.last_qty),
-                    "price": float(event.last_px),
-                    "order_id": str(event.client_order_id)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                f"Entry filled | Qty: {event.last_qty} | Px: {event.last_px}",
+                extra={
+                    "extra": {
+                        "event_type": "entry_filled_processed",
+                        "quantity": float(event.last_qty),
+                        "price": float(event.last_px),
+                        "order_id": str(event.client_order_id)
+                    }
                 }
-            }
-        )
+            )
         
         # Update tracking
         self._last_entry_price = float(event.last_px)
@@ -2025,10 +2098,9 @@ class BaseStrategy(Strategy):
             trading_data = getattr(self._integration_manager, 'trading_data_service', None)
             if trading_data:
                 direction = "LONG" if event.order_side == OrderSide.BUY else "SHORT"
-                entry_time = self.clock.utc_now().isoformat()
+                entry_time = self._now_iso()
                 
                 # Generate trade ID
-                from datetime import datetime
                 now = datetime.now()
                 self.active_trade_id = f"T-{self.strategy_id[:20]}-{now.strftime('%Y%m%d-%H%M%S')}"
                 
@@ -2043,35 +2115,12 @@ class BaseStrategy(Strategy):
                     }
                 )
                 
-                # Use synchronous start_trade from TradingDataService
-                trading_data.start_trade(
-                    trade_id=self.active_trade_id,
-                    strategy_id=self.strategy_id,
-                    instrument_id=str(self.instrument_id),
-                    trade_type="DAYTRADE",
-                    entry_price=float(event.last_px),
-                    quantity=float(event.last_qty),
-                    direction=direction,
-                    entry_time=entry_time,
-                )
-                self.save_state()
-                self.logger.info(
-                    f"Trade record started | ID: {self.active_trade_id}",
-                    extra={
-                        "extra": {
-                            "event_type": "trade_record_created",
-                            "trade_id": str(self.active_trade_id)
-                        }
-                    }
-                )
-                
-                
                 # Get order status for partial fill handling
                 order = self.cache.order(event.client_order_id)
                 status = order.status.name if order else "FILLED"
                 
-                # Record ENTRY order execution
-                trading_data.record_order(
+                # ENTRY order execution, written with the trade in one commit
+                entry_order = dict(
                     strategy_id=self.strategy_id,
                     instrument_id=str(self.instrument_id),
                     trade_type="DAYTRADE", 
@@ -2088,6 +2137,33 @@ class BaseStrategy(Strategy):
                     filled_price=float(event.last_px),
                     commission=0.0, 
                 )
+                
+                # Use synchronous start_trade from TradingDataService
+                started = trading_data.start_trade(
+                    trade_id=self.active_trade_id,
+                    strategy_id=self.strategy_id,
+                    instrument_id=str(self.instrument_id),
+                    trade_type="DAYTRADE",
+                    entry_price=float(event.last_px),
+                    quantity=float(event.last_qty),
+                    direction=direction,
+                    entry_time=entry_time,
+                    order=entry_order,
+                )
+                self.save_state()
+                if started is None:
+                    # Nothing was written; still keep the fill on record
+                    trading_data.record_order(**entry_order)
+                else:
+                    self.logger.info(
+                        f"Trade record started | ID: {self.active_trade_id}",
+                        extra={
+                            "extra": {
+                                "event_type": "trade_record_created",
+                                "trade_id": str(self.active_trade_id)
+                            }
+                        }
+                    )
             else:
                 self.logger.warning("No trading_data_service found on integration manager")
                 # Still save state even without service
@@ -2111,10 +2187,10 @@ class BaseStrategy(Strategy):
             trading_data = getattr(self._integration_manager, 'trading_data_service', None)
             if trading_data:
                 # Calculate PnL
-                exit_price = float(event.last_px)
+                exit_price = event.last_px.as_double()
                 entry_price = self._last_entry_price or 0.0
-                quantity = float(event.last_qty)
-                multiplier = float(self.instrument.multiplier) if self.instrument else 1.0
+                quantity = event.last_qty.as_double()
+                multiplier = self._multiplier
                 
                 # Simple PnL: (Exit - Entry) * Qty * Multiplier
                 # For shorts: (Entry - Exit) * Qty * Multiplier
@@ -2124,11 +2200,14 @@ class BaseStrategy(Strategy):
                     pnl = (entry_price - exit_price) * quantity * multiplier
                 
                 # Commission is a Money object in Nautilus Trader
-                if hasattr(event, 'commission') and event.commission is not None:
-                    commission = float(event.commission.as_double())
+                if BaseStrategy._EVENT_HAS_COMMISSION is None:
+                    BaseStrategy._EVENT_HAS_COMMISSION = hasattr(type(event), 'commission')
+                if BaseStrategy._EVENT_HAS_COMMISSION and event.commission is not None:
+                    commission = event.commission.as_double()
                 else:
                     commission = 0.0
-                exit_reason = getattr(self, '_last_exit_reason', 'UNKNOWN')
+                exit_reason = self._last_exit_reason
+                exit_time = self._now_iso()
                 
                 self.logger.info(
                     f"Closing trade record | ID: {self.active_trade_id} | Strategy: {self.strategy_id}",
@@ -2141,38 +2220,42 @@ class BaseStrategy(Strategy):
                     }
                 )
                 
-                # Use synchronous close_trade from TradingDataService
-                trading_data.close_trade(
-                    trade_id=self.active_trade_id,
-                    exit_price=exit_price,
-                    exit_reason=exit_reason,
-                    exit_time=self.clock.utc_now().isoformat(),
-                    commission=commission,
-                )
-                
                 # Get order status
                 order = self.cache.order(event.client_order_id)
                 status = order.status.name if order else "FILLED"
                 
-                # Record EXIT order execution
-                trading_data.record_order(
+                # EXIT order execution, written with the close in one commit
+                exit_order = dict(
                     strategy_id=self.strategy_id,
                     instrument_id=str(self.instrument_id),
                     trade_type="DAYTRADE", 
                     trade_direction="EXIT",
                     order_side=event.order_side.name,
                     order_type="MARKET",
-                    quantity=float(event.last_qty),
+                    quantity=quantity,
                     status=status,
-                    submitted_time=self.clock.utc_now().isoformat(),
+                    submitted_time=exit_time,
                     trade_id=self.active_trade_id,
                     client_order_id=str(event.client_order_id),
-                    filled_time=self.clock.utc_now().isoformat(),
-                    filled_quantity=float(event.last_qty),
-                    filled_price=float(event.last_px),
+                    filled_time=exit_time,
+                    filled_quantity=quantity,
+                    filled_price=exit_price,
                     commission=commission,
                 )
                 
+                # Use synchronous close_trade from TradingDataService
+                closed = trading_data.close_trade(
+                    trade_id=self.active_trade_id,
+                    exit_price=exit_price,
+                    exit_reason=exit_reason,
+                    exit_time=exit_time,
+                    commission=commission,
+                    order=exit_order,
+                )
+                if not closed:
+                    # Nothing was written; still keep the fill on record
+                    trading_data.record_order(**exit_order)
+                
                 self.logger.info(
                     f"Trade record closed | ID: {self.active_trade_id} | PnL: {pnl:.2f}",
                     extra={
@@ -2201,7 +2284,6 @@ class BaseStrategy(Strategy):
                 direction = "LONG" if position.side == PositionSide.LONG else "SHORT"
                 
                 # Generate trade ID for reconciled position
-                from datetime import datetime
                 now = datetime.now()
                 self.active_trade_id = f"T-REC-{self.strategy_id[:8]}-{now.strftime('%Y%m%d-%H%M%S')}"
                 
@@ -2213,28 +2295,41 @@ class BaseStrategy(Strategy):
                     entry_price=float(position.avg_px_open),
                     quantity=float(position.quantity),
                     direction=direction,
-                    entry_time=self.clock.utc_now().isoformat(),
+                    entry_time=self._now_iso(),
                 )
                 self.save_state()
                 self.logger.info(f"Trade record started for reconciled position: {self.active_trade_id}")
         except Exception as e:
             self.logger.error(f"Failed to start trade record from position: {e}")
 
+    def _now_iso(self) -> str:
+        """Clock time as ISO-8601, reused while the clock reads the same nanosecond."""
+        ts = self.clock.timestamp_ns()
+        if ts != self._now_iso_cache[0]:
+            self._now_iso_cache = (ts, unix_nanos_to_dt(ts).isoformat())
+        return self._now_iso_cache[1]
+
     def _schedule_async_task(self, coro):
         """Schedule async task in the strategy's event loop."""
         try:
-            import asyncio
-            loop = asyncio.get_event_loop()
+            # A strategy's handlers all run on one loop, so it is looked up
+            # once (and again only if that loop has been closed)
+            loop = self._async_loop
+            if loop is None or loop.is_closed():
+                # Handlers normally run on the node's (uvicorn's uvloop) loop;
+                # get_event_loop() is only the fallback outside a running loop
+                try:
+                    loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    loop = asyncio.get_event_loop()
+                self._async_loop = loop
             loop.create_task(coro)
         except Exception as e:
             self.logger.error(f"Failed to schedule async task: {e}")
 
     def on_bar(self, bar):
         """Handle bar event."""
-        try:
-            self.on_bar_safe(bar)
-        except Exception as e:
-            self.on_unexpected_error(e)
+        self._safe_call(self.on_bar_safe, bar)
 
     def on_quote_tick(self, tick):
         """
@@ -2242,28 +2337,71 @@ class BaseStrategy(Strategy):
         Important for spread trading - spreads typically only provide Bid/Ask quotes,
         not trade ticks (TradeTicks).
         """
-        try:
-            self.on_quote_tick_safe(tick)
-        except Exception as e:
-            self.on_unexpected_error(e)
+        self._safe_call(self.on_quote_tick_safe, tick)
 
     # =========================================================================
     # STATE PERSISTENCE
     # =========================================================================
 
-    def save_state(self):
-        """Persist current state."""
+    def save_state(self, force: bool = False):
+        """
+        Persist current state.
+        
+        A fill typically saves several times in a row. The first save writes
+        immediately; later saves within STATE_FLUSH_INTERVAL_NS only mark the
+        state dirty and are written together by a one-shot time alert at the
+        end of the window. force=True always writes now.
+        """
+        if not self.persistence:
+            return
+        self._state_dirty = True
+        
+        if not force:
+            try:
+                elapsed_ns = self.clock.timestamp_ns() - self._state_last_flush_ns
+                if elapsed_ns < STATE_FLUSH_INTERVAL_NS:
+                    if not self._state_flush_scheduled:
+                        self.clock.set_time_alert(
+                            name=self._state_flush_timer_name,
+                            alert_time=self.clock.utc_now()
+                            + timedelta(microseconds=(STATE_FLUSH_INTERVAL_NS - elapsed_ns) // 1000),
+                            callback=self._on_state_flush_alert,
+                        )
+                        self._state_flush_scheduled = True
+                    return
+            except Exception as e:
+                # No usable clock (e.g. not yet registered): write immediately
+                self.logger.debug(f"State flush deferral unavailable, writing now: {e}")
+        
+        self._flush_state_now()
+
+    def _on_state_flush_alert(self, alert):
+        """Write state deferred by save_state()."""
+        self._state_flush_scheduled = False
+        if self._state_dirty:
+            self._flush_state_now()
+
+    def _flush_state_now(self):
+        """Serialize and write the current state."""
         if self.persistence:
-            state = self.get_state()
+            state = self._state_buf
+            state.clear()
+            state.update(self.get_state())
             state['active_trade_id'] = self.active_trade_id
             state['signed_inventory'] = self.signed_inventory
             state['_last_entry_price'] = self._last_entry_price
             state['_last_entry_qty'] = self._last_entry_qty
-            state['_pending_entry_orders'] = [str(oid) for oid in self._pending_entry_orders]
-            state['_pending_exit_orders'] = [str(oid) for oid in self._pending_exit_orders]
+            pending = self._pending_orders.values()
+            state['_pending_entry_orders'] = [s for p, s in pending if p & PENDING_ENTRY]
+            state['_pending_exit_orders'] = [s for p, s in pending if p & PENDING_EXIT]
             state['_bracket_exit_map'] = {str(k): v for k, v in self._bracket_exit_map.items()}
             state['_pending_bracket_exits'] = {str(k): v for k, v in self._pending_bracket_exits.items()}
             self.persistence.save_state(self.strategy_id, state)
+            self._state_dirty = False
+            try:
+                self._state_last_flush_ns = self.clock.timestamp_ns()
+            except Exception:
+                self._state_last_flush_ns = 0
 
     def load_state(self):
         """Load state from persistence."""
@@ -2276,13 +2414,26 @@ class BaseStrategy(Strategy):
                 self._last_entry_price = state.get('_last_entry_price')
                 self._last_entry_qty = state.get('_last_entry_qty')
                 
-                # Restore pending orders (will be validated against cache)
-                self._pending_entry_orders = {
-                    ClientOrderId(oid) for oid in state.get('_pending_entry_orders', [])
-                }
-                self._pending_exit_orders = {
-                    ClientOrderId(oid) for oid in state.get('_pending_exit_orders', [])
-                }
+                # Restore pending orders, dropping those the cache knows to be
+                # closed. Ids the cache has not seen (not hydrated yet) are kept;
+                # known orders reuse the cache's own ClientOrderId objects.
+                # Orders may be on spread / option instruments, so each id is
+                # looked up on its own. An id saved in both lists gets both flags.
+                saved = [(PENDING_ENTRY, oid) for oid in state.get('_pending_entry_orders', [])]
+                saved += [(PENDING_EXIT, oid) for oid in state.get('_pending_exit_orders', [])]
+                self._pending_orders = {}
+                dropped = set()
+                for purpose, oid in saved:
+                    order_id = ClientOrderId(oid)
+                    order = self.cache.order(order_id)
+                    if order is None:
+                        self._mark_order(order_id, purpose)
+                    elif order.is_closed:
+                        dropped.add(oid)
+                    else:
+                        self._mark_order(order.client_order_id, purpose)
+                if dropped:
+                    self.logger.info(f"Dropped {len(dropped)} restored pending order(s) already closed in cache")
                 
                 self._bracket_exit_map = {
                     ClientOrderId(k): v for k, v in state.get('_bracket_exit_map', {}).items()
@@ -2329,7 +2480,14 @@ class BaseStrategy(Strategy):
         """Called when a quote tick is received (important for spread trading)."""
         pass
 
+    def _safe_call(self, fn, *args):
+        """Call a strategy hook, routing any exception to on_unexpected_error()."""
+        try:
+            fn(*args)
+        except Exception as e:
+            self.on_unexpected_error(e)
+
     def on_unexpected_error(self, error: Exception):
         """Called when an unhandled exception occurs."""
-        self.logger.exception(f"Unhandled strategy error in {self.strategy_id}: {error}")
-        self.logger.error(traceback.format_exc())
\ No newline at end of file
+        # exception() attaches the traceback; it is only formatted if emitted
+        self.logger.exception(f"Unhandled strategy error in {self.strategy_id}: {error}")
\ No newline at end of file
@@ -9,6 +9,12 @@ class StrategyConfig(BaseModel):
     instrument_id: str = Field(..., description="The instrument ID to trade (e.g., MESH6.CME)")
     strategy_type: str = Field(..., description="The type/class name of the strategy to instantiate")
     order_size: int = Field(1, description="Number of contracts/shares to buy/sell")
+    cross_venue_netting: bool = Field(
+        True,
+        description="Net open positions in the instrument's symbol across all venues "
+                    "(e.g. reconciled external positions); if False only positions on "
+                    "instrument_id are read, via the cache's instrument index",
+    )
     
     # Generic parameters container
     parameters: Dict[str, Any] = Field(default_factory=dict, description="Strategy-specific parameters")
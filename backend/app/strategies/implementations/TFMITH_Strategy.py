@@ -145,7 +145,7 @@ class TFMITHStrategy(BaseStrategy):
         self._last_position_status: Dict[str, Any] = {}
         self._last_known_delta: Optional[str] = None   # cached delta — updated only at log interval
 
-        # Private order tracking — NOT added to BaseStrategy's _pending_entry_orders
+        # Private order tracking — NOT marked in BaseStrategy's _pending_orders
         # so BaseStrategy._on_entry_filled never fires (same pattern as SPX strategies)
         self._tfmith_entry_orders: Set = set()
         self._tfmith_exit_orders: Set = set()
@@ -219,7 +219,7 @@ class TFMITHStrategy(BaseStrategy):
             )
             # Set timeout for instrument availability securely
             self.clock.set_time_alert(
-                name=f"{self.id}.instrument_timeout",
+                name=self._instrument_timer_name,
                 alert_time=self.clock.utc_now() + timedelta(seconds=60),
                 callback=self._on_instrument_timeout
             )
@@ -201,7 +201,7 @@ class Orb15MinLongCallDeltaStrategy(SPXBaseStrategy):
             return False, "Position already open"
         
         # Check no pending orders
-        if self._pending_entry_orders or self._pending_exit_orders:
+        if self._pending_orders:
             return False, "Orders already pending"
         
         # Check SPX price available
@@ -192,7 +192,7 @@ class Orb15MinLongPutStrategy(SPXBaseStrategy):
             return False, "Position already open"
         
         # Check no pending orders
-        if self._pending_entry_orders or self._pending_exit_orders:
+        if self._pending_orders:
             return False, "Orders already pending"
         
         # Check SPX price available
@@ -289,7 +289,7 @@ class Orb15MinLongPutStrategy(SPXBaseStrategy):
         order_id = event.client_order_id
         
         # Check if this was our active option exit
-        if self.active_option_id and order_id in self._pending_exit_orders:
+        if self.active_option_id and self._is_exit(order_id):
             # Position closed (either by SL, TP, or manual)
             self.logger.info(f"Active position closed via fill: {order_id}")
             self._clear_active_position_state()
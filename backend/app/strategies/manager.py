@@ -338,7 +338,7 @@ class StrategyManager:
             # First check if this strategy has ownership (active_trade_id)
             # This is the primary check to prevent showing other strategies' positions
             has_ownership = bool(strategy.active_trade_id)
-            has_pending_orders = bool(strategy._pending_entry_orders or strategy._pending_exit_orders)
+            has_pending_orders = bool(strategy._pending_orders)
             
             if not has_ownership and not has_pending_orders:
                 # This strategy doesn't own any position - don't even check cache
@@ -14,6 +14,8 @@ class PersistenceManager:
         self.data_dir = data_dir
         self.config_dir = os.path.join(data_dir, "config")
         self.state_dir = os.path.join(data_dir, "state")
+        # Last state written per strategy (compact JSON, without _last_updated)
+        self._saved_state: Dict[str, str] = {}
         self._ensure_directories()
 
     def _ensure_directories(self):
@@ -61,14 +63,28 @@ class PersistenceManager:
             return configs
 
     def save_state(self, strategy_id: str, state: Dict[str, Any]):
-        """Save strategy runtime state to disk"""
+        """
+        Save strategy runtime state to disk.
+        
+        The file is rewritten only when the state differs from the last one
+        saved; _last_updated therefore records the last actual change.
+        """
         try:
+            # The caller's dict is not modified (strategies reuse it per flush).
+            # Key order is kept rather than sorted: strategies fill it in a
+            # fixed order, and mixed key types would not sort
+            state = {k: v for k, v in state.items() if k != '_last_updated'}
+            snapshot = json.dumps(state)
+            if self._saved_state.get(strategy_id) == snapshot:
+                return
+            
             filepath = os.path.join(self.state_dir, f"{strategy_id}.json")
             # accurate timestamp for debugging
             state['_last_updated'] = datetime.utcnow().isoformat()
             
             with open(filepath, 'w') as f:
                 json.dump(state, f, indent=4)
+            self._saved_state[strategy_id] = snapshot
             logger.debug(f"Saved state for strategy {strategy_id}")
         except Exception as e:
             logger.error(f"Failed to save state for strategy {strategy_id}: {e}")
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Convert an existing trading database to incremental auto-vacuum.
+
+Runs a full VACUUM, which rewrites the file and needs about twice its size
+in free disk space. Run it while the backend is stopped:
+
+    python scripts/enable_incremental_vacuum.py [data/trading.db]
+"""
+
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+DB_PATH = "data/trading.db"
+
+
+def main():
+    db_path = sys.argv[1] if len(sys.argv) > 1 else DB_PATH
+    if not os.path.exists(db_path):
+        print(f"⚠️ Database not found at {db_path}")
+        return 1
+
+    from app.services.trading_data_service import TradingDataService
+    trading_data = TradingDataService(db_path=db_path)
+    print(f"\n🧹 Vacuuming {db_path}...")
+    ok = trading_data.enable_incremental_vacuum()
+    trading_data.close()
+    print("✅ Incremental auto-vacuum enabled" if ok else "❌ Failed, see log")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
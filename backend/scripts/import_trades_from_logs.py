@@ -146,8 +146,23 @@ def import_trades():
             entry_premium_per_contract=trade["entry_premium_per_contract"],
         )
         
-        # Record ENTRY order
-        service.record_order(
+        # Update metrics (peak profit/loss)
+        if trade["max_unrealized_profit"] > 0:
+            service.update_trade_metrics(trade["trade_id"], trade["max_unrealized_profit"])
+        if trade["max_unrealized_loss"] < 0:
+            service.update_trade_metrics(trade["trade_id"], trade["max_unrealized_loss"])
+        
+        # Close trade
+        service.close_trade(
+            trade_id=trade["trade_id"],
+            exit_price=trade["exit_price"],
+            exit_reason=trade["exit_reason"],
+            exit_time=trade["exit_time"],
+            commission=trade["commission"],
+        )
+        
+        # Record ENTRY and EXIT orders in one transaction
+        entry_order = dict(
             strategy_id=trade["strategy_id"],
             instrument_id=trade["instrument_id"],
             trade_type=trade["trade_type"],
@@ -165,24 +180,7 @@ def import_trades():
             filled_price=abs(trade["entry_price"]),
             commission=0.0,
         )
-        
-        # Update metrics (peak profit/loss)
-        if trade["max_unrealized_profit"] > 0:
-            service.update_trade_metrics(trade["trade_id"], trade["max_unrealized_profit"])
-        if trade["max_unrealized_loss"] < 0:
-            service.update_trade_metrics(trade["trade_id"], trade["max_unrealized_loss"])
-        
-        # Close trade
-        service.close_trade(
-            trade_id=trade["trade_id"],
-            exit_price=trade["exit_price"],
-            exit_reason=trade["exit_reason"],
-            exit_time=trade["exit_time"],
-            commission=trade["commission"],
-        )
-        
-        # Record EXIT order
-        service.record_order(
+        exit_order = dict(
             strategy_id=trade["strategy_id"],
             instrument_id=trade["instrument_id"],
             trade_type=trade["trade_type"],
@@ -200,6 +198,7 @@ def import_trades():
             filled_price=abs(trade["exit_price"]),
             commission=0.0,
         )
+        service.record_orders([entry_order, exit_order])
         
         result_emoji = "✅" if trade["result"] == "WIN" else "❌"
         print(f"{result_emoji} Imported: {trade['trade_id']} | {trade['trade_type']} | P&L: ${trade['pnl']:.2f}")
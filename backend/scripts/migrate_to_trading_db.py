@@ -59,11 +59,8 @@ def migrate_trades():
                 if c.fetchone():
                     continue
             
-            # Determine result
+            # result is generated from net_pnl by the trades schema
             pnl = rec['pnl'] or 0
-            result = rec['result']
-            if not result:
-                result = "WIN" if pnl > 0 else ("LOSS" if pnl < 0 else "EVEN")
             
             status = "CLOSED" if rec['exit_time'] else "OPEN"
             
@@ -84,9 +81,9 @@ def migrate_trades():
                         trade_id, strategy_id, instrument_id, trade_type,
                         entry_time, exit_time, duration_seconds,
                         entry_price, exit_price, quantity, direction,
-                        pnl, net_pnl, commission, result, status,
+                        pnl, net_pnl, commission, status,
                         exit_reason
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     trade_id,
                     rec['strategy_id'],
@@ -102,7 +99,6 @@ def migrate_trades():
                     pnl,
                     pnl - (rec['commission'] or 0),
                     rec['commission'] or 0,
-                    result,
                     status,
                     rec['exit_reason']
                 ))
@@ -179,9 +175,8 @@ def migrate_drawdowns():
                 except:
                     pass
             
-            # P&L and result
+            # P&L (result is generated from net_pnl by the trades schema)
             pnl = rec['final_result'] or 0
-            result = "WIN" if pnl > 0 else ("LOSS" if pnl < 0 else "EVEN")
             status = "CLOSED" if rec['exit_time'] else "CANCELLED"
             
             with trading_data._get_connection() as conn:
@@ -191,9 +186,9 @@ def migrate_drawdowns():
                         trade_id, strategy_id, instrument_id, trade_type,
                         entry_time, exit_time, duration_seconds,
                         entry_price, quantity, direction,
-                        pnl, net_pnl, result, status,
+                        pnl, net_pnl, status,
                         max_unrealized_loss, strikes, entry_premium_per_contract
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     trade_id,
                     strategy_id,
@@ -207,7 +202,6 @@ def migrate_drawdowns():
                     "LONG",
                     pnl,
                     pnl,
-                    result,
                     status,
                     rec['max_drawdown'],
                     strikes,
@@ -247,6 +241,10 @@ def main():
     drawdowns_migrated = migrate_drawdowns()
     print(f"   ✅ Migrated {drawdowns_migrated} drawdowns from trade_drawdowns.db")
     
+    # Rows above were inserted with raw SQL, so refresh the stats rollup
+    from app.services.trading_data_service import TradingDataService
+    TradingDataService(db_path=NEW_DB_PATH).rebuild_strategy_stats()
+    
     print("\n🧹 Cleaning up old databases...")
     cleanup_old_dbs()
     
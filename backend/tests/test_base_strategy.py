@@ -0,0 +1,282 @@
+"""
+BaseStrategy — Position Lookup and Pending Order Checks
+
+Exercises BaseStrategy helpers directly on a bare instance with internal
+state set by hand. Nautilus and pydantic are mocked via sys.modules, as in
+the strategy simulations.
+"""
+
+import sys
+import os
+from unittest.mock import MagicMock
+
+# ═══ STEP 1: Mock ALL external deps before any imports ═══════════════════════
+
+def _mock_mod():
+    m = MagicMock()
+    m.__all__ = []
+    return m
+
+_MOCK_MODULES = [
+    "nautilus_trader", "nautilus_trader.trading", "nautilus_trader.trading.strategy",
+    "nautilus_trader.model", "nautilus_trader.model.data", "nautilus_trader.model.enums",
+    "nautilus_trader.model.identifiers", "nautilus_trader.model.instruments",
+    "nautilus_trader.model.objects", "nautilus_trader.model.orders",
+    "nautilus_trader.model.position", "nautilus_trader.common", "nautilus_trader.common.enums",
+    "nautilus_trader.core", "nautilus_trader.core.datetime",
+    "pydantic", "pydantic_settings",
+]
+for mod in _MOCK_MODULES:
+    sys.modules.setdefault(mod, _mock_mod())
+
+class _FakeBaseModel:
+    def __init_subclass__(cls, **kw): pass
+    def __init__(self, **kwargs):
+        for k, v in kwargs.items():
+            setattr(self, k, v)
+    class Config:
+        extra = "allow"
+
+def _FakeField(*a, **kw):
+    return kw.get("default", kw.get("default_factory", lambda: None)())
+
+if not isinstance(getattr(sys.modules["pydantic"], "BaseModel", None), type):
+    sys.modules["pydantic"].BaseModel = _FakeBaseModel
+    sys.modules["pydantic"].Field = _FakeField
+
+class _FakeStrategy:
+    def __init__(self, config=None): pass
+if not isinstance(getattr(sys.modules["nautilus_trader.trading.strategy"], "Strategy", None), type):
+    sys.modules["nautilus_trader.trading.strategy"].Strategy = _FakeStrategy
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import app.strategies.base as base
+from app.strategies.base import BaseStrategy, PENDING_ENTRY, PENDING_EXIT
+
+# The enum members the module under test actually compares against
+LONG = base.PositionSide.LONG
+SHORT = base.PositionSide.SHORT
+
+
+# ═══ STEP 2: Helpers ═════════════════════════════════════════════════════════
+
+P = 0; F = 0
+
+def ok(name, cond, detail=""):
+    global P, F
+    if cond:
+        P += 1
+        print(f"  ✅ {name}")
+    else:
+        F += 1
+        print(f"  ❌ {name}  {detail}")
+
+
+class FakeId:
+    def __init__(self, symbol, venue):
+        self.symbol = symbol
+        self.venue = venue
+    def __eq__(self, other):
+        return isinstance(other, FakeId) and (self.symbol, self.venue) == (other.symbol, other.venue)
+    def __hash__(self):
+        return hash((self.symbol, self.venue))
+    def __str__(self):
+        return f"{self.symbol}.{self.venue}"
+
+
+class FakeQty:
+    def __init__(self, v):
+        self.raw = int(v * 1_000_000_000)
+        self._v = v
+    def __float__(self):
+        return float(self._v)
+
+
+class FakePosition:
+    def __init__(self, instrument_id, side, qty):
+        self.instrument_id = instrument_id
+        self.side = side
+        self.quantity = FakeQty(qty)
+
+
+class FakeOrder:
+    def __init__(self, client_order_id, instrument_id=None, is_closed=False):
+        self.client_order_id = client_order_id
+        self.instrument_id = instrument_id or MES
+        self.is_closed = is_closed
+
+
+class FakeCache:
+    def __init__(self):
+        self.positions = []
+        self.live_orders = []
+        self.calls = []
+    def order(self, client_order_id):
+        return next((o for o in self.live_orders if o.client_order_id == client_order_id), None)
+    def orders(self, instrument_id=None):
+        return [o for o in self.live_orders if instrument_id is None or o.instrument_id == instrument_id]
+    def orders_inflight(self, instrument_id=None):
+        return []
+    def orders_open(self, instrument_id=None):
+        return [o for o in self.orders(instrument_id) if not o.is_closed]
+    def positions_open(self, instrument_id=None):
+        self.calls.append(instrument_id)
+        if instrument_id is None:
+            return list(self.positions)
+        return [p for p in self.positions if p.instrument_id == instrument_id]
+
+
+class FakeClock:
+    """Frozen clock: every call happens at the same instant."""
+    def timestamp_ns(self):
+        return 1_767_625_200_000_000_000
+
+
+MES = FakeId("MESH6", "CME")
+MES_EXTERNAL = FakeId("MESH6", "CME-EXTERNAL")
+MNQ = FakeId("MNQH6", "CME")
+
+
+def make(netting=True):
+    s = object.__new__(BaseStrategy)
+    s.instrument_id = MES
+    s._instrument_symbol = MES.symbol
+    s._cross_venue_netting = netting
+    s.cache = FakeCache()
+    s.clock = FakeClock()
+    s.logger = MagicMock()
+    s._pending_orders = {}
+    return s
+
+
+def restore(s, entry, exit):
+    s.persistence = MagicMock()
+    s.persistence.load_state.return_value = {
+        "_pending_entry_orders": entry,
+        "_pending_exit_orders": exit,
+    }
+    s.strategy_id = "test-strategy"
+    # Saved ids are plain strings here, as are the fake cache's order ids
+    saved_cls = base.ClientOrderId
+    base.ClientOrderId = str
+    try:
+        s.load_state()
+    finally:
+        base.ClientOrderId = saved_cls
+
+
+# ═══ STEP 3: Tests ═══════════════════════════════════════════════════════════
+
+def t1():
+    print("\nT1: _get_open_position follows the cache within one clock instant")
+    s = make()
+    ok("flat with no positions", s._get_open_position() is None)
+
+    own = FakePosition(MES, LONG, 2)
+    s.cache.positions.append(own)
+    ok("own position seen at the same instant", s._get_open_position() is own)
+
+    # An external fill raises no event on this strategy
+    s.cache.positions.append(FakePosition(MES_EXTERNAL, SHORT, 2))
+    ok("offsetting external position nets to flat", s._get_open_position() is None)
+
+    s.cache.positions.pop()
+    s.cache.positions.append(FakePosition(MNQ, SHORT, 5))
+    ok("other symbols ignored", s._get_open_position() is own)
+
+    s.cache.positions.remove(own)
+    ok("closed position no longer reported", s._get_open_position() is None)
+
+
+def t2():
+    print("\nT2: cross-venue netting selects the scan")
+    s = make()
+    ghost = FakePosition(MES_EXTERNAL, LONG, 3)
+    s.cache.positions.append(ghost)
+    ok("netting scans every venue", s._get_open_position() is ghost and s.cache.calls[-1] is None)
+
+    s = make(netting=False)
+    s.cache.positions.append(ghost)
+    ok("without netting other venues are ignored", s._get_open_position() is None)
+    ok("without netting the instrument index is used", s.cache.calls[-1] == MES)
+
+
+def t3():
+    print("\nT3: purpose flags are OR'd per order")
+    s = make()
+    s._mark_order("O-1", PENDING_ENTRY)
+    s._mark_order("O-2", PENDING_EXIT)
+    ok("entry order", s._is_entry("O-1") and not s._is_exit("O-1"))
+    ok("exit order", s._is_exit("O-2") and not s._is_entry("O-2"))
+    ok("untracked order", s._order_purpose("O-3") == 0 and not s._is_entry("O-3") and not s._is_exit("O-3"))
+
+    s._mark_order("O-1", PENDING_EXIT)
+    ok("second purpose adds a flag", s._order_purpose("O-1") & PENDING_ENTRY and s._order_purpose("O-1") & PENDING_EXIT,
+       str(s._order_purpose("O-1")))
+    ok("cached id string kept", s._pending_orders["O-1"][1] == "O-1")
+    s._mark_order("O-2", PENDING_EXIT)
+    ok("re-marking is idempotent", s._order_purpose("O-2") == PENDING_EXIT)
+
+
+SPREAD = FakeId("SPX-SPREAD-1", "CBOE")
+
+
+def t4():
+    print("\nT4: load_state merges ids saved as both entry and exit")
+    s = make()
+    s.cache.live_orders = [FakeOrder("O-1"), FakeOrder("O-2"), FakeOrder("O-3"),
+                           FakeOrder("O-gone", is_closed=True)]
+    restore(s, entry=["O-1", "O-3", "O-gone"], exit=["O-2", "O-3", "O-gone"])
+    ok("entry-only id", s._order_purpose("O-1") == PENDING_ENTRY)
+    ok("exit-only id", s._order_purpose("O-2") == PENDING_EXIT)
+    ok("id in both lists keeps both flags", s._is_entry("O-3") and s._is_exit("O-3"), str(s._order_purpose("O-3")))
+    ok("closed orders are dropped", "O-gone" not in s._pending_orders)
+    ok("dropped count reported once per id", "Dropped 1 " in str(s.logger.info.call_args), str(s.logger.info.call_args))
+
+    # Cache not hydrated yet: ids are kept as saved
+    s = make()
+    restore(s, entry=["O-4", "O-5"], exit=["O-5"])
+    ok("unknown: entry-only id kept", s._order_purpose("O-4") == PENDING_ENTRY)
+    ok("unknown: id in both lists keeps both flags", s._order_purpose("O-5") == PENDING_ENTRY | PENDING_EXIT)
+
+
+def t5():
+    print("\nT5: load_state keeps live orders on other instruments")
+    s = make()
+    # An order on the base instrument used to mark the cache as hydrated
+    s.cache.live_orders = [FakeOrder("O-base", is_closed=True),
+                           FakeOrder("O-spread-entry", instrument_id=SPREAD),
+                           FakeOrder("O-spread-sl", instrument_id=SPREAD)]
+    restore(s, entry=["O-spread-entry"], exit=["O-spread-sl", "O-base"])
+    ok("live spread entry kept", s._order_purpose("O-spread-entry") == PENDING_ENTRY)
+    ok("live spread exit kept", s._order_purpose("O-spread-sl") == PENDING_EXIT)
+    ok("closed base order dropped", "O-base" not in s._pending_orders)
+
+
+# ═══ RUN ═════════════════════════════════════════════════════════════════════
+
+def main():
+    print("=" * 60)
+    print(" BaseStrategy — Helper Checks")
+    print("=" * 60)
+    for fn in [t1, t2, t3, t4, t5]:
+        try:
+            fn()
+        except Exception as e:
+            global F; F += 1
+            print(f"  💥 EXCEPTION in {fn.__name__}: {e}")
+            import traceback; traceback.print_exc()
+
+    print(f"\n{'=' * 60}")
+    print(f" RESULTS: {P} passed, {F} failed")
+    print(f"{'=' * 60}")
+    return F == 0
+
+
+def test_base_strategy():
+    assert main()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,148 @@
+"""
+Log Query API — Poll Cache Checks
+
+Drives the polled /tail and /errors handlers with get_logs replaced by a
+counting stub and a controllable monotonic clock. FastAPI and httpx are
+mocked via sys.modules, as in the strategy simulations.
+"""
+
+import sys
+import os
+import asyncio
+from unittest.mock import MagicMock
+
+# ═══ STEP 1: Mock ALL external deps before any imports ═══════════════════════
+
+class _FakeRouter:
+    def __init__(self, *a, **kw): pass
+    def _route(self, *a, **kw):
+        return lambda fn: fn
+    get = post = _route
+
+class _FakeHTTPException(Exception):
+    def __init__(self, status_code=500, detail=""):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+for mod in ["fastapi", "httpx"]:
+    sys.modules.setdefault(mod, MagicMock())
+sys.modules["fastapi"].APIRouter = _FakeRouter
+sys.modules["fastapi"].HTTPException = _FakeHTTPException
+sys.modules["fastapi"].Query = lambda *a, **kw: None
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import app.routers.logs as logs
+
+
+# ═══ STEP 2: Helpers ═════════════════════════════════════════════════════════
+
+P = 0; F = 0
+
+def ok(name, cond, detail=""):
+    global P, F
+    if cond:
+        P += 1
+        print(f"  ✅ {name}")
+    else:
+        F += 1
+        print(f"  ❌ {name}  {detail}")
+
+
+class Clock:
+    def __init__(self):
+        self.t = 1000.0
+    def monotonic(self):
+        return self.t
+
+
+def install():
+    """Counting get_logs stub and a fake monotonic clock; returns (calls, clock)."""
+    calls = []
+
+    async def fake_get_logs(**kwargs):
+        calls.append(kwargs)
+        return {"logs": [], "count": 0, "query": str(len(calls))}
+
+    clock = Clock()
+    logs._query_cache.clear()
+    logs.get_logs = fake_get_logs
+    logs.time = MagicMock(monotonic=clock.monotonic)
+    return calls, clock
+
+
+# ═══ STEP 3: Tests ═══════════════════════════════════════════════════════════
+
+def t1():
+    print("\nT1: polls 2 s apart share one query")
+    calls, clock = install()
+
+    async def run():
+        first = await logs.tail_logs(limit=50)
+        clock.t += 2.0
+        second = await logs.tail_logs(limit=50)
+        return first, second
+
+    first, second = asyncio.run(run())
+    ok("one get_logs call", len(calls) == 1, str(len(calls)))
+    ok("same response served", first is second)
+    ok("start fixed by the shared query", "start" in calls[0])
+
+
+def t2():
+    print("\nT2: the cache expires after CACHE_TTL")
+    calls, clock = install()
+
+    async def run():
+        await logs.get_recent_errors(limit=50)
+        clock.t += logs.CACHE_TTL + 0.1
+        await logs.get_recent_errors(limit=50)
+
+    asyncio.run(run())
+    ok("second query after expiry", len(calls) == 2, str(len(calls)))
+    ok("fresh start for the new query", calls[1]["start"] >= calls[0]["start"])
+
+
+def t3():
+    print("\nT3: different parameters and windows do not share")
+    calls, clock = install()
+
+    async def run():
+        await logs.tail_logs(limit=50)
+        await logs.tail_logs(limit=20)
+        await logs.get_recent_errors(limit=50)
+        await logs.tail_logs(level="ERROR", limit=50)
+
+    asyncio.run(run())
+    ok("four distinct queries", len(calls) == 4, str(len(calls)))
+    windows = sorted(round((c["start"] - calls[0]["start"]).total_seconds() / 60) for c in calls)
+    ok("errors use the hour window", windows[0] == -55, str(windows))
+
+
+# ═══ RUN ═════════════════════════════════════════════════════════════════════
+
+def main():
+    print("=" * 60)
+    print(" Log Query API — Poll Cache")
+    print("=" * 60)
+    for fn in [t1, t2, t3]:
+        try:
+            fn()
+        except Exception as e:
+            global F; F += 1
+            print(f"  💥 EXCEPTION in {fn.__name__}: {e}")
+            import traceback; traceback.print_exc()
+
+    print(f"\n{'=' * 60}")
+    print(f" RESULTS: {P} passed, {F} failed")
+    print(f"{'=' * 60}")
+    return F == 0
+
+
+def test_logs_router():
+    assert main()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
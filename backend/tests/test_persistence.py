@@ -0,0 +1,111 @@
+"""
+PersistenceManager — State File Checks
+
+Saves strategy state into a throwaway directory and checks the unchanged-state
+skip, that the caller's dict is left alone, and that any state json can write
+is still written.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.strategies.persistence import PersistenceManager
+
+
+# ═══ Helpers ═════════════════════════════════════════════════════════════════
+
+P = 0; F = 0
+
+def ok(name, cond, detail=""):
+    global P, F
+    if cond:
+        P += 1
+        print(f"  ✅ {name}")
+    else:
+        F += 1
+        print(f"  ❌ {name}  {detail}")
+
+
+def read_state(pm, strategy_id):
+    with open(os.path.join(pm.state_dir, f"{strategy_id}.json")) as f:
+        return json.load(f)
+
+
+# ═══ Tests ═══════════════════════════════════════════════════════════════════
+
+def t1():
+    print("\nT1: the caller's state dict is not modified")
+    d = tempfile.mkdtemp(prefix="persist_test_")
+    try:
+        pm = PersistenceManager(d)
+        state = {"active_trade_id": "T-1", "_last_updated": "2026-01-01T00:00:00"}
+        before = dict(state)
+        pm.save_state("s1", state)
+        ok("caller's dict unchanged", state == before and list(state) == list(before), str(state))
+        saved = read_state(pm, "s1")
+        ok("state written", saved["active_trade_id"] == "T-1")
+        ok("fresh _last_updated written", saved["_last_updated"] != before["_last_updated"])
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def t2():
+    print("\nT2: unchanged state skips the write, changed state rewrites")
+    d = tempfile.mkdtemp(prefix="persist_test_")
+    try:
+        pm = PersistenceManager(d)
+        pm.save_state("s1", {"loss_streak": 1})
+        path = os.path.join(pm.state_dir, "s1.json")
+        with open(path, "w") as f:
+            f.write('{"marker": true}')
+        pm.save_state("s1", {"loss_streak": 1})
+        ok("identical state not rewritten", read_state(pm, "s1") == {"marker": True})
+        pm.save_state("s1", {"loss_streak": 2})
+        ok("changed state rewritten", read_state(pm, "s1")["loss_streak"] == 2)
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def t3():
+    print("\nT3: mixed key types are still written")
+    d = tempfile.mkdtemp(prefix="persist_test_")
+    try:
+        pm = PersistenceManager(d)
+        pm.save_state("s1", {"fills": {1: 2.5, "total": 2.5}, "active_trade_id": None})
+        saved = read_state(pm, "s1")
+        ok("state with int and str keys saved", saved.get("fills") == {"1": 2.5, "total": 2.5}, str(saved))
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+# ═══ RUN ═════════════════════════════════════════════════════════════════════
+
+def main():
+    print("=" * 60)
+    print(" PersistenceManager — State Files")
+    print("=" * 60)
+    for fn in [t1, t2, t3]:
+        try:
+            fn()
+        except Exception as e:
+            global F; F += 1
+            print(f"  💥 EXCEPTION in {fn.__name__}: {e}")
+            import traceback; traceback.print_exc()
+
+    print(f"\n{'=' * 60}")
+    print(f" RESULTS: {P} passed, {F} failed")
+    print(f"{'=' * 60}")
+    return F == 0
+
+
+def test_persistence():
+    assert main()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -69,6 +69,7 @@ sys.modules["nautilus_trader.common.enums"].ComponentState = MagicMock()
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from app.strategies.base import PENDING_EXIT
 from app.strategies.config import StrategyConfig
 from app.strategies.implementations.TFMITH_Strategy import TFMITHStrategy
 
@@ -215,8 +216,7 @@ def make():
     s.cache.instruments.return_value = []
     s.clock = MagicMock(); s.id = "TFMITH-001"
     s.persistence = None
-    s._pending_entry_orders = set()
-    s._pending_exit_orders = set()
+    s._pending_orders = {}
 
     s._trading_data = MagicMock()
     s._trading_data.start_trade.return_value = "T-001"
@@ -448,7 +448,7 @@ def t16():
     s._total_commission = 3.25
     # Exit at $1.50 → PnL = (1.50-2.00)*100*5 = -250 - commission
     event = MFE(coid="O-EXIT", lpx=1.50, lqty=5.0, side="SELL")
-    s._pending_exit_orders.add("O-EXIT")
+    s._mark_order("O-EXIT", PENDING_EXIT)
     s._on_exit_fill(event)
     ok("loss_streak=2", s.loss_streak == 2, f"got {s.loss_streak}")
     ok("allocation decreased", s.current_allocation < 10000.0, f"got {s.current_allocation}")
@@ -465,7 +465,7 @@ def t17():
     s._total_commission = 3.25
     # Exit at $3.00 → PnL = (3-2)*100*5 = 500 - commission
     event = MFE(coid="O-EXIT2", lpx=3.00, lqty=5.0, side="SELL")
-    s._pending_exit_orders.add("O-EXIT2")
+    s._mark_order("O-EXIT2", PENDING_EXIT)
     s._on_exit_fill(event)
     ok("loss_streak=0", s.loss_streak == 0)
     ok("allocation increased", s.current_allocation > 8000.0, f"got {s.current_allocation}")
@@ -481,7 +481,7 @@ def t18():
     # Exit at $2.50 → raw PnL = (2.50-2.00)*100*10 = 500
     # Net PnL = 500 - 6.50 - exit_comm
     event = MFE(coid="O-EXIT3", lpx=2.50, lqty=10.0, side="SELL", comm=6.50)
-    s._pending_exit_orders.add("O-EXIT3")
+    s._mark_order("O-EXIT3", PENDING_EXIT)
     s._on_exit_fill(event)
     expected_net = 500.0 - 6.50 - 6.50  # entry + exit comm
     expected_alloc = 10000.0 + expected_net
@@ -0,0 +1,445 @@
+"""
+TradingDataService — Schema, Rollup and Metrics Checks
+
+Runs the service against throwaway SQLite files: migration of a pre-versioning
+(v0) database, the strategy_stats rollup kept by triggers against a full
+rebuild, and the deferred trade metrics around close/cancel/shutdown.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import app.services.trading_data_service as tds
+from app.services.trading_data_service import TradingDataService
+
+# Only the tests flush metrics; the maintenance thread would race them
+tds.METRICS_FLUSH_INTERVAL = 3600
+tds.CHECKPOINT_INTERVAL = 3600
+
+
+# ═══ Helpers ═════════════════════════════════════════════════════════════════
+
+P = 0; F = 0
+
+def ok(name, cond, detail=""):
+    global P, F
+    if cond:
+        P += 1
+        print(f"  ✅ {name}")
+    else:
+        F += 1
+        print(f"  ❌ {name}  {detail}")
+
+
+# Schema as created before PRAGMA user_version was tracked
+_V0_SCHEMA_SQL = """
+    CREATE TABLE orders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        strategy_id TEXT NOT NULL,
+        instrument_id TEXT NOT NULL,
+        exchange_order_id TEXT UNIQUE,
+        client_order_id TEXT,
+        trade_id TEXT,
+        trade_type TEXT NOT NULL,
+        trade_direction TEXT NOT NULL,
+        order_side TEXT NOT NULL,
+        order_type TEXT NOT NULL,
+        quantity REAL NOT NULL,
+        price_limit REAL,
+        status TEXT NOT NULL DEFAULT 'SUBMITTED',
+        submitted_time TEXT NOT NULL,
+        filled_time TEXT,
+        filled_quantity REAL DEFAULT 0,
+        filled_price REAL,
+        commission REAL DEFAULT 0.0,
+        raw_data TEXT,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+    CREATE TABLE trades (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        trade_id TEXT UNIQUE NOT NULL,
+        strategy_id TEXT NOT NULL,
+        instrument_id TEXT NOT NULL,
+        trade_type TEXT NOT NULL,
+        entry_reason TEXT,
+        entry_target_price REAL,
+        entry_stop_loss REAL,
+        strikes TEXT,
+        expiration TEXT,
+        legs TEXT,
+        strategy_config TEXT,
+        entry_time TEXT NOT NULL,
+        exit_time TEXT,
+        duration_seconds INTEGER,
+        entry_price REAL NOT NULL,
+        exit_price REAL,
+        quantity REAL NOT NULL,
+        direction TEXT NOT NULL,
+        pnl REAL,
+        commission REAL DEFAULT 0.0,
+        net_pnl REAL,
+        result TEXT,
+        max_profit REAL,
+        max_loss REAL,
+        max_unrealized_profit REAL DEFAULT 0.0,
+        max_unrealized_loss REAL DEFAULT 0.0,
+        max_unrealized_loss_time TEXT,
+        entry_premium_per_contract REAL,
+        pnl_snapshots TEXT,
+        status TEXT NOT NULL DEFAULT 'OPEN',
+        exit_reason TEXT,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+    CREATE INDEX idx_orders_strategy ON orders(strategy_id);
+    CREATE INDEX idx_orders_trade_id ON orders(trade_id);
+    CREATE INDEX idx_orders_filled_time ON orders(filled_time);
+    CREATE INDEX idx_trades_strategy ON trades(strategy_id);
+    CREATE INDEX idx_trades_entry_time ON trades(entry_time);
+    CREATE INDEX idx_trades_status ON trades(status);
+"""
+
+_V0_TRADES = [
+    # trade_id, strategy_id, entry_time, pnl, commission, net_pnl, stored result, max_unrealized_loss, status
+    ("T-A-1", "strat_a", "2026-01-05T15:00:00Z", 120.0, 2.0, 118.0, "WIN", -40.0, "CLOSED"),
+    ("T-A-2", "strat_a", "2026-01-06T15:00:00Z", -80.0, 2.0, -82.0, "WIN", -95.0, "CLOSED"),  # stale label
+    ("T-A-3", "strat_a", "2026-01-07T15:00:00Z", 2.0, 2.0, 0.0, None, -10.0, "CLOSED"),
+    ("T-B-1", "strat_b", "2026-01-05T16:30:00Z", -50.0, 1.0, -51.0, "LOSS", -60.0, "CLOSED"),
+    ("T-B-2", "strat_b", "2026-01-08T16:30:00Z", None, 0.0, None, None, -5.0, "OPEN"),
+]
+
+
+def tmp_db():
+    d = tempfile.mkdtemp(prefix="tds_test_")
+    return d, os.path.join(d, "trading.db")
+
+
+def make_v0_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(_V0_SCHEMA_SQL)
+    conn.executemany(
+        "INSERT INTO trades (trade_id, strategy_id, instrument_id, trade_type, entry_time, "
+        "entry_price, quantity, direction, pnl, commission, net_pnl, result, "
+        "max_unrealized_loss, status) "
+        "VALUES (?, ?, 'SPX.CBOE', 'PUT_CREDIT_SPREAD', ?, -1.0, 1, 'LONG', ?, ?, ?, ?, ?, ?)",
+        _V0_TRADES,
+    )
+    conn.commit()
+    conn.close()
+
+
+def stats_rows(svc):
+    """strategy_stats as comparable tuples (sums rounded past float noise)."""
+    with svc._get_connection() as conn:
+        rows = conn.execute("SELECT * FROM strategy_stats ORDER BY strategy_id").fetchall()
+    return [tuple(round(v, 6) if isinstance(v, float) else v for v in tuple(r)) for r in rows]
+
+
+def rollup_matches_rebuild(svc):
+    incremental = stats_rows(svc)
+    svc.rebuild_strategy_stats()
+    rebuilt = stats_rows(svc)
+    return incremental == rebuilt, f"{incremental} != {rebuilt}"
+
+
+def open_trade(svc, trade_id, strategy_id="strat_a", entry_price=-1.0, quantity=2):
+    return svc.start_trade(
+        trade_id=trade_id,
+        strategy_id=strategy_id,
+        instrument_id="SPXW260123P06895000.CBOE",
+        trade_type="PUT_CREDIT_SPREAD",
+        entry_price=entry_price,
+        quantity=quantity,
+        direction="LONG",
+    )
+
+
+def db_metrics(svc, trade_id):
+    with svc._get_connection() as conn:
+        row = conn.execute(
+            "SELECT max_unrealized_profit, max_unrealized_loss FROM trades WHERE trade_id = ?",
+            (trade_id,),
+        ).fetchone()
+    return tuple(row) if row else None
+
+
+# ═══ Tests ═══════════════════════════════════════════════════════════════════
+
+def t1():
+    print("\nT1: v0 file with trades migrates to the generated columns and rollup")
+    d, path = tmp_db()
+    try:
+        make_v0_db(path)
+        svc = TradingDataService(path)
+        with svc._get_connection() as conn:
+            cols = {c["name"]: c["hidden"] for c in conn.execute("PRAGMA table_xinfo(trades)")}
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            results = dict(conn.execute("SELECT trade_id, result FROM trades").fetchall())
+            entry_ts = conn.execute("SELECT entry_ts FROM trades WHERE trade_id = 'T-A-1'").fetchone()[0]
+            indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        ok("result is a generated column", cols.get("result", 0) != 0, str(cols.get("result")))
+        ok("entry_ts / exit_ts added", "entry_ts" in cols and "exit_ts" in cols)
+        ok("result derived from net_pnl",
+           results == {"T-A-1": "WIN", "T-A-2": "LOSS", "T-A-3": "BREAKEVEN", "T-B-1": "LOSS", "T-B-2": None},
+           str(results))
+        ok("entry_ts is epoch ms of entry_time", entry_ts == 1767625200000, str(entry_ts))
+        ok("superseded indexes dropped",
+           not indexes & {"idx_trades_strategy", "idx_trades_entry_time", "idx_trades_status", "idx_orders_trade_id"},
+           str(indexes))
+        ok("version held at 6 until incremental vacuum is enabled", version == 6, str(version))
+
+        a = svc.get_strategy_stats("strat_a")
+        b = svc.get_strategy_stats("strat_b")
+        ok("strat_a rollup backfilled",
+           (a["total_trades"], a["wins"], a["losses"], a["net_pnl"], a["worst_drawdown"]) == (3, 1, 1, 36.0, -95.0),
+           str(a))
+        ok("strat_b rollup skips open trades",
+           (b["total_trades"], b["losses"], b["net_pnl"]) == (1, 1, -51.0), str(b))
+        match, detail = rollup_matches_rebuild(svc)
+        ok("backfilled rollup equals rebuild", match, detail)
+
+        ok("enable_incremental_vacuum succeeds", svc.enable_incremental_vacuum() is True)
+        with svc._get_connection() as conn:
+            ok("auto_vacuum is incremental", conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2)
+            ok("version bumped to current",
+               conn.execute("PRAGMA user_version").fetchone()[0] == tds.SCHEMA_VERSION)
+        svc.close()
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def t2():
+    print("\nT2: re-opening a migrated file is a no-op")
+    d, path = tmp_db()
+    try:
+        make_v0_db(path)
+        TradingDataService(path).close()
+        svc = TradingDataService(path)
+        a = svc.get_strategy_stats("strat_a")
+        ok("rollup not double counted", a["total_trades"] == 3, str(a))
+        match, detail = rollup_matches_rebuild(svc)
+        ok("rollup equals rebuild", match, detail)
+        svc.close()
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def t3():
+    print("\nT3: start → metrics → close keeps strategy_stats equal to a rebuild")
+    d, path = tmp_db()
+    try:
+        svc = TradingDataService(path)
+        with svc._get_connection() as conn:
+            ok("fresh file at current version",
+               conn.execute("PRAGMA user_version").fetchone()[0] == tds.SCHEMA_VERSION)
+        for i, (exit_price, commission) in enumerate([(-0.4, 2.6), (-1.7, 2.6), (-1.0, 0.0)]):
+            tid = f"T-{i}"
+            open_trade(svc, tid)
+            svc.update_trade_metrics(tid, current_pnl=-35.5)
+            svc.update_trade_metrics(tid, current_pnl=60.25)
+            ok(f"{tid} closed", svc.close_trade(tid, exit_price=exit_price, exit_reason="TAKE_PROFIT", commission=commission))
+        open_trade(svc, "T-B", strategy_id="strat_b")
+        svc.close_trade("T-B", exit_price=-0.9, exit_reason="EOD", commission=1.3)
+        open_trade(svc, "T-open")
+        svc.update_trade_metrics("T-open", current_pnl=-12.0)
+
+        stats = svc.get_strategy_stats("strat_a")
+        ok("three closed trades counted", stats["total_trades"] == 3, str(stats))
+        ok("drawdown reached the rollup", stats["worst_drawdown"] == -35.5, str(stats))
+        match, detail = rollup_matches_rebuild(svc)
+        ok("rollup equals rebuild after closes", match, detail)
+        svc.close()
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def t4():
+    print("\nT4: delete and reconcile keep strategy_stats equal to a rebuild")
+    d, path = tmp_db()
+    try:
+        svc = TradingDataService(path)
+        for tid, exit_price in [("T-1", -0.5), ("T-2", -1.6), ("T-3", -0.8)]:
+            open_trade(svc, tid)
+            svc.update_trade_metrics(tid, current_pnl=-20.0)
+            svc.close_trade(tid, exit_price=exit_price, exit_reason="TAKE_PROFIT", commission=2.6)
+
+        ok("delete closed trade", svc.delete_trade("T-2"))
+        ok("deleted trade leaves the rollup", svc.get_strategy_stats("strat_a")["total_trades"] == 2)
+        match, detail = rollup_matches_rebuild(svc)
+        ok("rollup equals rebuild after delete", match, detail)
+
+        ok("reconcile closed trade",
+           svc.reconcile_trade_fills("T-1", actual_entry_price=-1.05, actual_exit_price=-1.3,
+                                     entry_commission=1.3, exit_commission=1.4))
+        trade = svc.get_trade("T-1")
+        ok("reconciled trade flips to a loss", trade["result"] == "LOSS", str(trade["result"]))
+        match, detail = rollup_matches_rebuild(svc)
+        ok("rollup equals rebuild after reconcile", match, detail)
+
+        ok("delete missing trade is harmless", svc.delete_trade("T-missing"))
+        match, detail = rollup_matches_rebuild(svc)
+        ok("rollup unchanged by missing delete", match, detail)
+        svc.close()
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def t5():
+    print("\nT5: dirty metrics around close_trade, cancel_trade and close()")
+    d, path = tmp_db()
+    try:
+        svc = TradingDataService(path)
+
+        # close_trade writes the final metrics itself; the queued entry is skipped
+        open_trade(svc, "T-close")
+        svc.update_trade_metrics("T-close", current_pnl=-42.0)
+        ok("update is queued, not written", "T-close" in svc._dirty_trades and db_metrics(svc, "T-close") == (0.0, 0.0),
+           str(db_metrics(svc, "T-close")))
+        svc.close_trade("T-close", exit_price=-0.5, exit_reason="TAKE_PROFIT")
+        ok("close_trade writes the metrics", db_metrics(svc, "T-close")[1] == -42.0, str(db_metrics(svc, "T-close")))
+        ok("flush after close writes nothing", svc.flush_trade_metrics() == 0)
+
+        # cancel_trade deliberately drops the queued metrics
+        open_trade(svc, "T-cancel")
+        svc.update_trade_metrics("T-cancel", current_pnl=-17.0)
+        svc.cancel_trade("T-cancel")
+        ok("flush after cancel writes nothing", svc.flush_trade_metrics() == 0)
+        ok("cancelled trade keeps stored metrics", db_metrics(svc, "T-cancel") == (0.0, 0.0),
+           str(db_metrics(svc, "T-cancel")))
+
+        # Explicit flush
+        open_trade(svc, "T-flush")
+        svc.update_trade_metrics("T-flush", current_pnl=25.0)
+        svc.update_trade_metrics("T-flush", current_pnl=30.0)
+        ok("repeated updates flush as one row", svc.flush_trade_metrics() == 1)
+        ok("flushed metrics stored", db_metrics(svc, "T-flush")[0] == 30.0, str(db_metrics(svc, "T-flush")))
+
+        # close() flushes whatever is still queued
+        open_trade(svc, "T-shutdown")
+        svc.update_trade_metrics("T-shutdown", current_pnl=-9.5)
+        svc.close()
+        svc2 = TradingDataService(path)
+        ok("close() flushed the queued metrics", db_metrics(svc2, "T-shutdown")[1] == -9.5,
+           str(db_metrics(svc2, "T-shutdown")))
+        svc2.close()
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def t6():
+    print("\nT6: update_trade_metrics_bulk matches repeated update_trade_metrics")
+    d, path = tmp_db()
+    try:
+        svc = TradingDataService(path)
+        pnls = [3.004, -12.126, 40.0, -12.13, -30.555, 18.2, -30.56, 41.999, 5.0]
+        stamps = [1767625200.0 + 60 * i for i in range(len(pnls))]
+
+        def tracked(tid):
+            t = svc._active_trades[tid]
+            return (t["max_unrealized_profit"], t["max_unrealized_loss"], t["max_dd_time"],
+                    list(t["snapshot_ts"]), list(t["snapshot_pnl"]))
+
+        for label, ts in [("ISO", [tds._utc_iso(x) for x in stamps]), ("default", None)]:
+            open_trade(svc, f"T-scalar-{label}")
+            open_trade(svc, f"T-bulk-{label}")
+            for i, pnl in enumerate(pnls):
+                svc.update_trade_metrics(f"T-scalar-{label}", current_pnl=pnl, timestamp=ts and ts[i])
+            ok(f"bulk update ({label} timestamps)", svc.update_trade_metrics_bulk(f"T-bulk-{label}", pnls, ts))
+            scalar, bulk = tracked(f"T-scalar-{label}"), tracked(f"T-bulk-{label}")
+            if ts is None:
+                # Per-call defaults read the clock each time; only the values can match
+                scalar, bulk = scalar[:2] + scalar[4:], bulk[:2] + bulk[4:]
+            ok(f"same extremes, drawdown time and snapshots ({label})", scalar == bulk, f"{scalar} != {bulk}")
+
+        # Earlier observations already hold the extremes: nothing to persist
+        svc.flush_trade_metrics()
+        ok("bulk within existing extremes", svc.update_trade_metrics_bulk("T-bulk-ISO", [1.0, -2.0]))
+        ok("nothing queued for unchanged extremes", "T-bulk-ISO" not in svc._dirty_trades)
+
+        before = tracked("T-bulk-ISO")
+        ok("length mismatch rejected", svc.update_trade_metrics_bulk("T-bulk-ISO", [-99.0, 99.0], stamps[:1]) is False)
+        ok("rejected batch leaves the trade untouched", tracked("T-bulk-ISO") == before)
+        ok("empty batch is a no-op", svc.update_trade_metrics_bulk("T-bulk-ISO", []) and tracked("T-bulk-ISO") == before)
+
+        svc.update_trade_metrics_bulk("T-bulk-ISO", [-50.0])
+        ok("bulk drawdown flushed", svc.flush_trade_metrics() == 1 and db_metrics(svc, "T-bulk-ISO")[1] == -50.0,
+           str(db_metrics(svc, "T-bulk-ISO")))
+        svc.close()
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def order_kwargs(direction, side, price):
+    return dict(
+        strategy_id="strat_a", instrument_id="SPXW260123P06895000.CBOE",
+        trade_type="PUT_CREDIT_SPREAD", trade_direction=direction, order_side=side,
+        order_type="LIMIT", quantity=2, status="FILLED",
+        submitted_time="2026-01-05T15:00:00Z", filled_price=price, filled_quantity=2,
+    )
+
+
+def t7():
+    print("\nT7: bulk start/close accept an order per trade")
+    d, path = tmp_db()
+    try:
+        svc = TradingDataService(path)
+        base_trade = dict(strategy_id="strat_a", instrument_id="SPXW260123P06895000.CBOE",
+                          trade_type="PUT_CREDIT_SPREAD", entry_price=-1.0, quantity=2, direction="LONG")
+        trades = [
+            dict(base_trade, trade_id="T-1", order=order_kwargs("ENTRY", "SELL", -1.0)),
+            dict(base_trade, trade_id="T-2"),
+        ]
+        started = svc.start_trades_bulk(trades)
+        ok("both trades started", started == ["T-1", "T-2"], str(started))
+        ok("caller's items left intact", "order" in trades[0])
+        ok("entry order written with its trade", [o["trade_direction"] for o in svc.get_trade_orders("T-1")] == ["ENTRY"])
+        ok("no order for the trade without one", svc.get_trade_orders("T-2") == [])
+
+        closed = svc.close_trades_bulk([
+            dict(trade_id="T-1", exit_price=-0.4, exit_reason="TAKE_PROFIT", commission=2.6,
+                 order=order_kwargs("EXIT", "BUY", -0.4)),
+            dict(trade_id="T-2", exit_price=-1.5, exit_reason="STOP_LOSS"),
+        ])
+        ok("both trades closed", closed == ["T-1", "T-2"], str(closed))
+        directions = sorted(o["trade_direction"] for o in svc.get_trade_orders("T-1"))
+        ok("exit order written with the close", directions == ["ENTRY", "EXIT"], str(directions))
+        ok("trades closed in the database", svc.get_trade("T-2")["status"] == "CLOSED")
+        match, detail = rollup_matches_rebuild(svc)
+        ok("rollup equals rebuild after bulk closes", match, detail)
+        svc.close()
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+# ═══ RUN ═════════════════════════════════════════════════════════════════════
+
+def main():
+    print("=" * 60)
+    print(" TradingDataService — Schema, Rollup and Metrics")
+    print("=" * 60)
+    for fn in [t1, t2, t3, t4, t5, t6, t7]:
+        try:
+            fn()
+        except Exception as e:
+            global F; F += 1
+            print(f"  💥 EXCEPTION in {fn.__name__}: {e}")
+            import traceback; traceback.print_exc()
+
+    print(f"\n{'=' * 60}")
+    print(f" RESULTS: {P} passed, {F} failed")
+    print(f"{'=' * 60}")
+    return F == 0
+
+
+def test_trading_data_service():
+    assert main()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)